@@ -1,13 +1,30 @@
+import os
+import threading
+
 from google.adk.apps.app import App, EventsCompactionConfig
 
-from app.subagents.orchestrator.agent import root_agent
+from app.subagents.lazy import lazy_agent_exports
+from app.subagents.orchestrator.agent import get_root_agent, token_gated_summarizer
 
-# Create and export the app instance
-app = App(
-    root_agent=root_agent,
-    name="app",
-    events_compaction_config=EventsCompactionConfig(
-        compaction_interval=3,  # Trigger compaction every 3 invocations
-        overlap_size=1,  # Keep 1 previous turn for context
+# Lazy-loaded app instance wrapping the orchestrator root agent (PEP 562)
+get_root_agent, get_app, __getattr__ = lazy_agent_exports(
+    "root_agent",
+    get_root_agent,
+    lambda agent: App(
+        root_agent=agent,
+        name="app",
+        events_compaction_config=EventsCompactionConfig(
+            compaction_interval=3,  # Trigger compaction every 3 invocations
+            overlap_size=1,  # Keep 1 previous turn for context
+            summarizer=token_gated_summarizer(agent),
+        ),
     ),
 )
+
+# Pure lazy loading trades cold-start RAM for first-request latency. When
+# BUYSPY_PREWARM=1, build the app on a background thread at import so agent
+# construction (including the Google auth round trip) overlaps with server
+# startup; get_app() still blocks until construction completes. Tests and
+# tooling that only need cheap imports leave the flag unset.
+if os.environ.get("BUYSPY_PREWARM") == "1":
+    threading.Thread(target=get_app, name="buyspy-prewarm", daemon=True).start()
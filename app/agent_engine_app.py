@@ -17,31 +17,49 @@ import logging
 import os
 from typing import Any
 
-import google.auth
-import vertexai
-from google.adk.artifacts import GcsArtifactService, InMemoryArtifactService
-from google.cloud import logging as google_cloud_logging
-from opentelemetry import trace
-from opentelemetry.sdk.trace import TracerProvider, export
 from vertexai.agent_engines.templates.adk import AdkApp
 
-from app.agent import app
-from app.app_utils.tracing import CloudTraceLoggingSpanExporter
 from app.app_utils.typing import Feedback
 
+# Lazy-loaded Cloud Logging client; each Client() opens its own gRPC
+# channel, so repeated set_up calls should share one.
+_logging_client: Any = None
+
+
+def _get_logging_client() -> Any:
+    from google.cloud import logging as google_cloud_logging
+
+    global _logging_client
+    if _logging_client is None:
+        _logging_client = google_cloud_logging.Client()
+    return _logging_client
+
 
 class AgentEngineApp(AdkApp):
     def set_up(self) -> None:
         """Set up logging and tracing for the agent engine app."""
+        # Deferred imports: tracing/logging SDKs are only needed once the
+        # engine is actually set up, not when this module is imported.
+        from opentelemetry import trace
+        from opentelemetry.sdk.trace import TracerProvider, export
+
+        from app.app_utils.tracing import CloudTraceLoggingSpanExporter
+
         super().set_up()
         logging.basicConfig(level=logging.INFO)
-        logging_client = google_cloud_logging.Client()
-        self.logger = logging_client.logger(__name__)
+        self.logger = _get_logging_client().logger(__name__)
         provider = TracerProvider()
+        # Larger, less frequent batches: the agent emits many small spans,
+        # and the defaults (512 spans / 5s) cost one Cloud Trace RPC per
+        # small batch.
         processor = export.BatchSpanProcessor(
             CloudTraceLoggingSpanExporter(
                 project_id=os.environ.get("GOOGLE_CLOUD_PROJECT")
-            )
+            ),
+            max_queue_size=8192,
+            max_export_batch_size=2048,
+            schedule_delay_millis=10000,
+            export_timeout_millis=60000,
         )
         provider.add_span_processor(processor)
         trace.set_tracer_provider(provider)
@@ -63,11 +81,20 @@ class AgentEngineApp(AdkApp):
 
 def _create_agent_engine() -> AgentEngineApp:
     """Create and initialize the agent engine."""
+    import google.auth
+    import vertexai
+    from google.adk.artifacts import GcsArtifactService, InMemoryArtifactService
+
+    from app.agent import get_app
+    from app.config import get_settings
+
     _, project_id = google.auth.default()
     vertexai.init(project=project_id, location="europe-north1")
-    artifacts_bucket_name = os.environ.get("ARTIFACTS_BUCKET_NAME")
+    # Captured once here; the builder closure reuses the validated value
+    # instead of re-reading the environment per invocation.
+    artifacts_bucket_name = get_settings().artifacts_bucket_name
     return AgentEngineApp(
-        app=app,
+        app=get_app(),
         artifact_service_builder=lambda: GcsArtifactService(
             bucket_name=artifacts_bucket_name
         )
@@ -0,0 +1,67 @@
+"""Country to search region-code mapping.
+
+Mapping a country mention to a region code ("Finland" -> "fi-fi") is a
+static lookup; doing it in the LLM burns instruction tokens and can
+produce inconsistent codes. This module detects the country in the user's
+message with one compiled regex pass and returns the region code, so the
+agents receive it as structured context instead of mapping rules.
+"""
+
+import re
+
+# Full country names, matched case-insensitively.
+_REGION_MAP = {
+    "finland": "fi-fi",
+    "usa": "us-en",
+    "united states": "us-en",
+    "united kingdom": "uk-en",
+    "germany": "de-de",
+    "sweden": "se-sv",
+    "norway": "no-no",
+    "denmark": "dk-da",
+    "france": "fr-fr",
+    "spain": "es-es",
+    "italy": "it-it",
+    "netherlands": "nl-nl",
+}
+
+# Two-letter codes are ordinary English words or fragments when lowercase
+# ("help us find...", "wi-fi" — the hyphen is a word boundary), so they
+# only match written as uppercase codes: "US", "UK". Hyphens are excluded
+# from the boundaries so "WI-FI" doesn't match either.
+_CODE_MAP = {
+    "US": "us-en",
+    "UK": "uk-en",
+    "FI": "fi-fi",
+    "DE": "de-de",
+}
+
+# One alternation over all known names, longest first so "united states"
+# wins over "usa". Word boundaries avoid false positives inside words.
+_REGION_RE = re.compile(
+    r"\b(?:"
+    + "|".join(re.escape(name) for name in sorted(_REGION_MAP, key=len, reverse=True))
+    + r")\b",
+    re.IGNORECASE,
+)
+
+# Case-sensitive on purpose; see _CODE_MAP.
+_CODE_RE = re.compile(r"(?<![\w-])(?:" + "|".join(sorted(_CODE_MAP)) + r")(?![\w-])")
+
+
+def detect_region(text: str) -> str | None:
+    """Detect a shopping region code from free-form text.
+
+    Args:
+        text: The user's message
+
+    Returns:
+        Region code like "fi-fi" if a known country is mentioned, else None
+    """
+    match = _REGION_RE.search(text)
+    if match is not None:
+        return _REGION_MAP[match.group(0).lower()]
+    code_match = _CODE_RE.search(text)
+    if code_match is not None:
+        return _CODE_MAP[code_match.group(0)]
+    return None
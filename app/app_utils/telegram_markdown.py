@@ -8,11 +8,20 @@ The telegramify_markdown library is used for proper Telegram MarkdownV2 escaping
 but we apply additional post-processing to fix period escaping in URLs.
 """
 
+import functools
 import re
-from urllib.parse import urlparse
 
 import telegramify_markdown
 
+# Compiled once at import: these run on every outgoing bot message, so the
+# per-call re-module cache probe is pure overhead.
+_LINK_RE = re.compile(r"\[([^\]]+)\]\(([^)]+)\)")
+_URL_RE = re.compile(r'https?://[^\s<>"{}|\\^`\[\]]+')
+
+# Any MarkdownV2 special character; when a message has none of these there
+# is nothing to escape or normalize.
+_ANY_SPECIAL_RE = re.compile(r"[_*\[\]()~`>#+\-=|{}.!\\]")
+
 
 def escape_markdown_v2(text: str) -> str:
     """Escape special characters for Telegram MarkdownV2 format using telegramify_markdown.
@@ -33,6 +42,11 @@ def escape_markdown_v2(text: str) -> str:
     if not text:
         return text
 
+    # Fast path: a message with no MarkdownV2 special characters needs no
+    # escaping and contains no markdown to normalize.
+    if not _ANY_SPECIAL_RE.search(text):
+        return text
+
     # Use telegramify_markdown for proper escaping
     escaped_text = telegramify_markdown.standardize(text)
 
@@ -54,14 +68,20 @@ def _fix_periods_in_urls(text: str) -> str:
     Returns:
         Text with periods in URLs unescaped
     """
-    # Find all markdown links and fix periods in URLs
-    result = ""
+    # Cheap substring probe before any regex work: the common case is a
+    # plain sentence with no links at all.
+    if "](" not in text:
+        return text
+
+    # Find all markdown links and fix periods in URLs; collect pieces and
+    # join once instead of growing a string per segment.
+    parts = []
     current_pos = 0
 
-    for match in re.finditer(r"\[([^\]]+)\]\(([^)]+)\)", text):
+    for match in _LINK_RE.finditer(text):
         # Add any regular text before this link (with current escaping)
         if match.start() > current_pos:
-            result += text[current_pos : match.start()]
+            parts.append(text[current_pos : match.start()])
 
         # Add the link with fixed URL escaping
         link_text = match.group(1)
@@ -71,15 +91,15 @@ def _fix_periods_in_urls(text: str) -> str:
         fixed_url = link_url.replace(r"\.", ".")
 
         # Keep other escaping intact
-        result += f"[{link_text}]({fixed_url})"
+        parts.append(f"[{link_text}]({fixed_url})")
 
         current_pos = match.end()
 
     # Add any remaining regular text (after the last link)
     if current_pos < len(text):
-        result += text[current_pos:]
+        parts.append(text[current_pos:])
 
-    return result
+    return "".join(parts)
 
 
 def convert_urls_to_links(text: str) -> str:
@@ -98,15 +118,16 @@ def convert_urls_to_links(text: str) -> str:
     Returns:
         Text with URLs converted to Markdown links
     """
+    # Cheap substring probes before any regex work: most messages carry no
+    # URLs at all, and the link check only matters when "](" appears.
+    if "http" not in text:
+        return text
+
     # Check if there are any existing markdown links
-    existing_link_pattern = r"\[([^\]]+)\]\(([^)]+)\)"
-    if re.search(existing_link_pattern, text):
+    if "](" in text and _LINK_RE.search(text):
         # There are already links, don't modify anything
         return text
 
-    # URL pattern that matches raw URLs
-    url_pattern = r'https?://[^\s<>"{}|\\^`\[\]]+'
-
     def replace_url(match: re.Match) -> str:
         """Convert a matched URL to a Markdown link with the store name.
 
@@ -120,10 +141,31 @@ def convert_urls_to_links(text: str) -> str:
             Markdown-formatted link string in format [StoreName](URL)
         """
         url = match.group(0)
+        return f"[{_store_name_for(url)}]({url})"
+
+    return _URL_RE.sub(replace_url, text)
+
+
+def _host(url: str) -> str:
+    """Extract the host from a URL without the full urlparse machinery.
+
+    We only need the host here; urlparse builds a ParseResult plus six
+    substrings per call.
+    """
+    i = url.find("://")
+    start = i + 3 if i >= 0 else 0
+    end = url.find("/", start)
+    host = url[start:end] if end >= 0 else url[start:]
+    if host.startswith("www."):
+        host = host[4:]
+    return host
 
-        # Extract store name from domain
-        domain = urlparse(url).netloc.replace("www.", "")
-        store_name = domain.split(".")[0].capitalize()
-        return f"[{store_name}]({url})"
 
-    return re.sub(url_pattern, replace_url, text)
+@functools.lru_cache(maxsize=512)
+def _store_name_for(url: str) -> str:
+    """Derive a display store name from a URL's domain, memoized per URL.
+
+    Bot traffic keeps linking the same handful of shop domains, so the
+    host-split/capitalize work is done once per distinct URL.
+    """
+    return _host(url).split(".")[0].capitalize()
@@ -0,0 +1,132 @@
+"""Offline batch runner for evaluation and ingestion jobs.
+
+Interactive chat runs one prompt per request, which is the wrong shape for
+offline work: each call pays full per-request overhead and nothing
+overlaps. `run_batch` fans prompts out concurrently under an
+`asyncio.Semaphore` and a simple requests-per-minute limiter, so
+throughput is bounded by quota instead of sequential latency.
+
+Usage (one JSON object with a "prompt" field per line, or plain text
+lines; results are written to stdout as JSON lines):
+
+    python -m app.batch eval.jsonl --max-concurrency 10 --rpm 100
+"""
+
+import argparse
+import asyncio
+import json
+import time
+
+from app.agent_engine_app import get_agent_engine
+
+
+async def run_batch(
+    prompts: list[str], max_concurrency: int = 10, rpm: int = 100
+) -> list[str]:
+    """Run a batch of prompts through the agent engine concurrently.
+
+    Args:
+        prompts: Prompts to process
+        max_concurrency: Maximum number of prompts in flight at once
+        rpm: Maximum requests started per minute
+
+    Returns:
+        One response text per prompt, in input order; failures are
+        returned inline as "ERROR: ..." strings instead of failing the
+        whole batch
+    """
+    engine = get_agent_engine()
+    semaphore = asyncio.Semaphore(max_concurrency)
+    interval = 60.0 / rpm
+    next_slot = time.monotonic()
+    slot_lock = asyncio.Lock()
+
+    async def _acquire_slot() -> None:
+        """Space request starts `interval` seconds apart (RPM limit)."""
+        nonlocal next_slot
+        async with slot_lock:
+            now = time.monotonic()
+            wait = next_slot - now
+            next_slot = max(next_slot, now) + interval
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    async def _one(index: int, prompt: str) -> str:
+        async with semaphore:
+            await _acquire_slot()
+            response_text = ""
+            async for event in engine.async_stream_query(
+                message=prompt,
+                user_id="batch",
+                session_id=f"batch-{index}",
+            ):
+                content = event.get("content") or {}
+                for part in content.get("parts") or []:
+                    if part.get("text"):
+                        response_text += part["text"]
+            return response_text
+
+    results = await asyncio.gather(
+        *(_one(index, prompt) for index, prompt in enumerate(prompts)),
+        return_exceptions=True,
+    )
+    return [
+        f"ERROR: {result}" if isinstance(result, BaseException) else result
+        for result in results
+    ]
+
+
+def _read_prompts(path: str) -> list[str]:
+    """Read prompts from a JSONL file (with a "prompt" field) or plain text lines."""
+    prompts = []
+    with open(path, encoding="utf-8") as input_file:
+        for line in input_file:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                prompts.append(line)
+                continue
+            if isinstance(record, dict) and "prompt" in record:
+                prompts.append(str(record["prompt"]))
+            else:
+                prompts.append(line)
+    return prompts
+
+
+def main(argv: list[str] | None = None) -> None:
+    """CLI entry point for offline batch runs."""
+    parser = argparse.ArgumentParser(
+        description="Run a batch of prompts through the agent engine."
+    )
+    parser.add_argument(
+        "input",
+        help="JSONL file with a 'prompt' field per line, or plain text lines",
+    )
+    parser.add_argument(
+        "--max-concurrency",
+        type=int,
+        default=10,
+        help="Maximum prompts in flight at once (default: 10)",
+    )
+    parser.add_argument(
+        "--rpm",
+        type=int,
+        default=100,
+        help="Maximum requests started per minute (default: 100)",
+    )
+    args = parser.parse_args(argv)
+
+    prompts = _read_prompts(args.input)
+    results = asyncio.run(
+        run_batch(prompts, max_concurrency=args.max_concurrency, rpm=args.rpm)
+    )
+
+    for prompt, response in zip(prompts, results, strict=True):
+        print(json.dumps({"prompt": prompt, "response": response}, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
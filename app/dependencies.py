@@ -14,6 +14,12 @@ from app.config import Settings, get_settings
 from app.services.budget_service import BudgetService
 from app.services.telegram_service import TelegramService
 
+# Module-level singletons, resolved lazily on first use. These sit on the
+# per-message request path, so even the lru_cache dispatch inside
+# get_settings() is worth skipping after the first call.
+_config: Settings | None = None
+_redis_client: redis_asyncio.Redis | None = None
+
 
 def get_config() -> Settings:
     """
@@ -22,13 +28,13 @@ def get_config() -> Settings:
     Returns the cached Settings instance containing all application
     configuration loaded from environment variables.
 
-    Note: Caching is handled by get_settings() in app.config,
-    so no additional caching is needed here.
-
     Returns:
         Settings: The application settings instance
     """
-    return get_settings()
+    global _config
+    if _config is None:
+        _config = get_settings()
+    return _config
 
 
 def get_agent_engine() -> AgentEngineApp:
@@ -47,17 +53,28 @@ def get_agent_engine() -> AgentEngineApp:
 
 def get_redis_client() -> redis_asyncio.Redis:
     """
-    Get Redis client instance.
+    Get the shared Redis client instance.
+
+    The client (and its connection pool) is created once and reused;
+    building a new client per call would also build a new connection
+    pool per call.
 
     Returns:
         redis_asyncio.Redis: Redis client configured from settings
     """
-    config = get_config()
-    return redis_asyncio.Redis(
-        host=config.redis_host,
-        port=config.redis_port,
-        decode_responses=True,
-    )
+    global _redis_client
+    if _redis_client is None:
+        config = get_config()
+        # Explicit bounded pool shared by every consumer of the client;
+        # without it each Redis() grows its own implicit pool.
+        pool = redis_asyncio.ConnectionPool(
+            host=config.redis_host,
+            port=config.redis_port,
+            max_connections=50,
+            decode_responses=True,
+        )
+        _redis_client = redis_asyncio.Redis(connection_pool=pool)
+    return _redis_client
 
 
 def get_budget_service() -> BudgetService:
@@ -103,4 +120,5 @@ def get_telegram_service() -> TelegramService:
         agent_engine=engine,
         budget_service=budget_service,
         timeout_seconds=600,  # 10 minutes timeout for agent processing
+        redis_client=get_redis_client(),
     )
@@ -3,6 +3,16 @@
 import logging
 from typing import Any
 
+# Server-side INCR plus first-hit EXPIRE in a single round-trip. redis-py
+# caches the script by SHA, so after the first call this is one EVALSHA.
+_INCR_WITH_TTL_SCRIPT = """
+local count = redis.call('INCR', KEYS[1])
+if count == 1 then
+    redis.call('EXPIRE', KEYS[1], ARGV[1])
+end
+return count
+"""
+
 
 class BudgetService:
     """Service for managing user message budgets using Redis rate limiting.
@@ -14,6 +24,8 @@ class BudgetService:
     Note: All methods are async to integrate seamlessly with the async TelegramService.
     """
 
+    _KEY_PREFIX = "budget:"
+
     def __init__(
         self,
         redis_client: Any,
@@ -35,13 +47,21 @@ class BudgetService:
         # Use provided values
         self.limit = limit
         self.ttl = ttl
-        self.whitelist = whitelist
+        # Normalized to a frozenset once so the per-message membership
+        # check is a single hash lookup instead of a list scan.
+        self.whitelist: frozenset[str] = frozenset(
+            str(user).strip() for user in whitelist
+        )
+
+        # Registered once; callable awaits a single EVALSHA round-trip.
+        self._incr_with_ttl = redis_client.register_script(_INCR_WITH_TTL_SCRIPT)
 
     async def check_and_increment(self, user_id: str) -> bool:
         """Check if user has budget remaining and increment their counter.
 
-        This method implements atomic rate limiting using Redis INCR and EXPIRE
-        operations. If the user ID is whitelisted, they always get access.
+        This method implements atomic rate limiting using a server-side Lua
+        script that runs INCR and, on the first increment, EXPIRE in one
+        round-trip. If the user ID is whitelisted, they always get access.
 
         Args:
             user_id: The Telegram user ID as a string
@@ -53,22 +73,16 @@ class BudgetService:
             Exception: If Redis operations fail, propagates the error
         """
         # Check whitelist first - whitelisted users bypass limits
-        if str(user_id) in self.whitelist:
+        # (user_id is already a str; whitelist entries are normalized)
+        if user_id in self.whitelist:
             self.logger.info(f"User {user_id} is whitelisted - bypassing budget check")
             return True
 
         # Redis key format for budget tracking
-        budget_key = f"budget:{user_id}"
+        budget_key = self._KEY_PREFIX + user_id
 
-        # Atomic INCR operation using aioredis
-        current_count = await self.redis_client.incr(budget_key)
-
-        # If this is the first increment (count == 1), set the TTL
-        if current_count == 1:
-            await self.redis_client.expire(budget_key, self.ttl)
-            self.logger.debug(
-                f"Set TTL for budget key {budget_key}: {self.ttl} seconds"
-            )
+        # Atomic INCR + conditional EXPIRE in a single Redis round-trip
+        current_count = await self._incr_with_ttl(keys=[budget_key], args=[self.ttl])
 
         # Check if within limit
         if current_count <= self.limit:
@@ -90,7 +104,7 @@ class BudgetService:
             True if reset was successful, False otherwise
         """
         try:
-            budget_key = f"budget:{user_id}"
+            budget_key = self._KEY_PREFIX + user_id
             result = await self.redis_client.delete(budget_key)
 
             if result:
@@ -116,7 +130,7 @@ class BudgetService:
             Current count if available, None on error
         """
         try:
-            budget_key = f"budget:{user_id}"
+            budget_key = self._KEY_PREFIX + user_id
             count = await self.redis_client.get(budget_key)
 
             if count is not None:
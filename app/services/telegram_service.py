@@ -1,5 +1,8 @@
 import asyncio
+import contextlib
 import logging
+import time
+from collections.abc import AsyncIterable
 from typing import Any
 from venv import logger
 
@@ -12,24 +15,47 @@ from telegram.ext import (
     MessageHandler,
     filters,
 )
+from telegram.request import HTTPXRequest
 
 from app.agent_engine_app import AgentEngineApp
+from app.app_utils.region import detect_region
 from app.app_utils.telegram_markdown import (
     convert_urls_to_links,
     escape_markdown_v2,
 )
 from app.services.budget_service import BudgetService
 
+# Static outbound strings, built once at import instead of per call.
+_WELCOME_MESSAGE = (
+    "👋 Welcome to BuySpy AI Assistant!\n\n"
+    "I'm here to help you with information and answer your questions. "
+    "Just send me a message and I'll do my best to assist you.\n\n"
+    "You can ask me about:\n"
+    "• Weather information\n"
+    "• Current time\n"
+    "• And much more!\n\n"
+    "What can I help you with today?"
+)
+_ERROR_MESSAGE_MD2 = escape_markdown_v2(
+    "I apologize, but I encountered an error processing your message. "
+    "Please try again in a moment."
+)
+
 
 class TelegramService:
     """Service for handling Telegram bot message routing to the agent engine."""
 
+    # Responses longer than this are formatted off the event loop
+    _FORMAT_IN_THREAD_THRESHOLD = 4096
+
     def __init__(
         self,
         bot_token: str,
         agent_engine: AgentEngineApp,
         budget_service: BudgetService,
         timeout_seconds: int = 600,
+        max_concurrent_chats: int = 20,
+        redis_client: Any | None = None,
     ):
         """Initialize the Telegram service with bot token and agent engine instance.
 
@@ -38,19 +64,39 @@ class TelegramService:
             agent_engine: Agent engine instance
             budget_service: Budget service for rate limiting
             timeout_seconds: Timeout for agent processing in seconds (default: 600 = 10 minutes)
+            max_concurrent_chats: Cap on concurrently processed messages;
+                each one holds an ADK streaming session against Vertex
+            redis_client: Optional Redis client backing the known-session
+                cache so restarts skip the per-chat create-session RPC
         """
         self.agent_engine = agent_engine
         self.bot_token = bot_token
         self.budget_service = budget_service
         self.timeout_seconds = timeout_seconds
+        self.redis_client = redis_client
         self.logger = logging.getLogger(__name__)
         self.application: Application | None = None
-        self._sessions: set[str] = set()
+        # chat_id -> monotonic expiry; bounded TTL cache of known ADK
+        # sessions so long-running polling processes don't grow unbounded
+        self._sessions: dict[str, float] = {}
+        # Admission control: a message flood must not spawn unbounded
+        # concurrent agent sessions
+        self._semaphore = asyncio.Semaphore(max_concurrent_chats)
+        # Per-chat locks: rapid-fire messages from one chat run FIFO
+        # against the shared session instead of racing the agent.
+        # _chat_lock_refs counts holders plus waiters per chat so idle
+        # locks can be pruned without poking asyncio.Lock internals.
+        self._chat_locks: dict[int, asyncio.Lock] = {}
+        self._chat_lock_refs: dict[int, int] = {}
 
     async def handle_message(
         self, update: Update, context: ContextTypes.DEFAULT_TYPE
     ) -> None:
         """Handle incoming messages from Telegram users."""
+        acquired_slot = False
+        chat_lock: asyncio.Lock | None = None
+        lock_ref_chat_id: int | None = None
+        acquired_chat_lock = False
         try:
             # Check for required attributes
             if (
@@ -67,6 +113,7 @@ class TelegramService:
                 self.logger.warning("Message has no text")
                 return
             chat_id = update.effective_chat.id
+            chat_id_str = str(chat_id)
             user_id = str(update.effective_user.id)
 
             # Check user budget before processing message
@@ -86,49 +133,79 @@ class TelegramService:
                 )
                 return
 
+            # Serialize processing within this chat before taking a global
+            # slot: queued messages from one chat would otherwise each pin
+            # a slot while waiting on the chat lock, and a single spammy
+            # chat could starve every other user out of admission
+            chat_lock = self._chat_locks.setdefault(chat_id, asyncio.Lock())
+            lock_ref_chat_id = chat_id
+            self._chat_lock_refs[chat_id] = self._chat_lock_refs.get(chat_id, 0) + 1
+            await chat_lock.acquire()
+            acquired_chat_lock = True
+
+            # Admission control after the budget check: wait briefly for a
+            # processing slot and tell the user to retry when saturated
+            try:
+                await asyncio.wait_for(self._semaphore.acquire(), timeout=2)
+                acquired_slot = True
+            except asyncio.TimeoutError:
+                self.logger.warning(
+                    f"No processing slot for user {user_id}; asking to retry"
+                )
+                await update.message.reply_text(
+                    "🚦 I'm handling a lot of requests right now. Please try again in a moment."
+                )
+                return
+
             # Log the incoming message
             self.logger.info(
-                f"Received message from user {update.effective_user.id} in chat {chat_id}: {user_message[:100]}{'...' if len(user_message) > 100 else ''}"
+                "Received message from user %s in chat %s: %s%s",
+                user_id,
+                chat_id_str,
+                user_message[:100],
+                "..." if len(user_message) > 100 else "",
             )
 
             # Send "typing" action to show the bot is processing
             await context.bot.send_chat_action(chat_id=chat_id, action="typing")
 
             session_id = await self._get_or_create_adk_session_id(
-                telegram_user_id=str(update.effective_user.id),
-                telegram_chat_id=str(chat_id),
+                telegram_user_id=user_id,
+                telegram_chat_id=chat_id_str,
             )
 
             logging.info(f"Using session ID: {session_id}")
 
+            # Resolve the search region code in Python so the agents get it
+            # as structured context instead of burning tokens on the mapping
+            region_code = detect_region(user_message)
+            agent_message = (
+                f"{user_message}\n\n[Region code: {region_code}]"
+                if region_code
+                else user_message
+            )
+
             # Pass the message to the agent engine and process streaming response with timeout
-            processing_task = None
             response_text = ""
+            draft_message_id: int | None = None
 
             try:
-                # Start the agent processing as a task
-                processing_task = asyncio.create_task(
+                # wait_for wraps the coroutine itself and cancels it on
+                # timeout, so no separate task bookkeeping is needed
+                response_text, _event_count, draft_message_id = await asyncio.wait_for(
                     self._process_agent_response(
-                        user_message,
-                        user_id=str(update.effective_user.id),
-                        session_id=str(chat_id),
+                        agent_message,
+                        user_id=user_id,
+                        session_id=chat_id_str,
                         context=context,
-                        chat_id=str(chat_id),
-                    )
-                )
-
-                # Wait for completion with timeout
-                response_text, _event_count = await asyncio.wait_for(
-                    processing_task, timeout=self.timeout_seconds
+                        chat_id=chat_id_str,
+                    ),
+                    timeout=self.timeout_seconds,
                 )
 
             except asyncio.TimeoutError:
-                # Cancel the processing task if it's still running
-                if processing_task and not processing_task.done():
-                    processing_task.cancel()
-
                 self.logger.warning(
-                    f"Agent processing timed out after {self.timeout_seconds} seconds for user {update.effective_user.id}"
+                    f"Agent processing timed out after {self.timeout_seconds} seconds for user {user_id}"
                 )
                 response_text = (
                     "I apologize, but my processing is taking longer than expected. "
@@ -153,17 +230,37 @@ class TelegramService:
                 f"Sending response ({len(response_text)} chars) to chat {chat_id}"
             )
 
-            self.logger.info(f"Raw output from agent text: {response_text}")
-
-            # Convert raw URLs to Markdown links (if any exist)
-            formatted_text = convert_urls_to_links(response_text)
+            # Convert raw URLs to Markdown links, then escape markdown while
+            # preserving link syntax. Long outputs go through a worker
+            # thread so the CPU-bound string work doesn't stall the event
+            # loop for other chats; short ones stay inline to skip the
+            # thread-hop overhead.
+            if len(response_text) > self._FORMAT_IN_THREAD_THRESHOLD:
+                formatted_text = await asyncio.to_thread(
+                    lambda: escape_markdown_v2(convert_urls_to_links(response_text))
+                )
+            else:
+                formatted_text = escape_markdown_v2(
+                    convert_urls_to_links(response_text)
+                )
 
-            self.logger.info(f"After converting URLs to links: {formatted_text}")
+            # Full payloads only at DEBUG; serializing multi-KB responses
+            # through the log handler happens on the event loop thread.
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug(
+                    "chat=%s raw=%r formatted=%r",
+                    chat_id,
+                    response_text,
+                    formatted_text,
+                )
 
-            # Escape markdown while preserving link syntax
-            formatted_text = escape_markdown_v2(formatted_text)
+            # Replace the streamed draft (if any) with the formatted reply
+            if draft_message_id is not None:
+                with contextlib.suppress(Exception):
+                    await context.bot.delete_message(
+                        chat_id=chat_id, message_id=draft_message_id
+                    )
 
-            self.logger.info(f"Sending formatted text: {formatted_text}")
             await update.message.reply_markdown_v2(
                 formatted_text, disable_web_page_preview=False
             )
@@ -177,22 +274,50 @@ class TelegramService:
             )
 
             # Send user-friendly error message to Telegram
-            error_message = "I apologize, but I encountered an error processing your message. Please try again in a moment."
             try:
                 if update.message:
                     await update.message.reply_markdown_v2(
-                        error_message, disable_web_page_preview=False
+                        _ERROR_MESSAGE_MD2, disable_web_page_preview=False
                     )
             except Exception as send_error:
-                chat_id_str: str = (
+                error_chat_id = (
                     str(update.effective_chat.id)
                     if update.effective_chat
                     else "unknown"
                 )
                 self.logger.error(
-                    f"Failed to send error message to chat {chat_id_str}: {send_error}",
+                    f"Failed to send error message to chat {error_chat_id}: {send_error}",
                     exc_info=True,
                 )
+        finally:
+            if acquired_slot:
+                self._semaphore.release()
+            if chat_lock is not None and acquired_chat_lock:
+                chat_lock.release()
+            if lock_ref_chat_id is not None:
+                # Prune idle locks so the per-chat map stays bounded;
+                # a zero refcount means no holder and no waiter remains
+                remaining = self._chat_lock_refs.get(lock_ref_chat_id, 1) - 1
+                if remaining <= 0:
+                    self._chat_lock_refs.pop(lock_ref_chat_id, None)
+                    self._chat_locks.pop(lock_ref_chat_id, None)
+                else:
+                    self._chat_lock_refs[lock_ref_chat_id] = remaining
+
+    # Known-session cache bounds: entries expire after a day and the cache
+    # never holds more than this many chats.
+    _SESSION_CACHE_MAX = 10_000
+    _SESSION_TTL_SECONDS = 86_400.0
+
+    # Redis set of chat ids with an existing ADK session; survives restarts
+    _SESSIONS_KEY = "telegram:adk_sessions"
+
+    def _remember_session(self, telegram_chat_id: str) -> None:
+        """Record a known session in the in-memory TTL cache."""
+        if len(self._sessions) >= self._SESSION_CACHE_MAX:
+            # Drop the oldest entry (insertion order approximates age)
+            self._sessions.pop(next(iter(self._sessions)))
+        self._sessions[telegram_chat_id] = time.monotonic() + self._SESSION_TTL_SECONDS
 
     async def _get_or_create_adk_session_id(
         self, telegram_user_id: str, telegram_chat_id: str
@@ -203,25 +328,44 @@ class TelegramService:
         """
 
         # Check local storage first
-        if telegram_chat_id in self._sessions:
+        expiry = self._sessions.get(telegram_chat_id)
+        if expiry is not None and expiry > time.monotonic():
             logger.warning(f"Using existing session ID ({telegram_chat_id})")
             return telegram_chat_id
 
-        try:
-            # The 'user_id' parameter is for long-term memory association (Memory Bank feature)
+        # Then the persistent store: after a restart this skips the
+        # create-session RPC (and its expected already-exists failure)
+        if self.redis_client is not None:
+            with contextlib.suppress(Exception):
+                if await self.redis_client.sismember(
+                    self._SESSIONS_KEY, telegram_chat_id
+                ):
+                    self._remember_session(telegram_chat_id)
+                    return telegram_chat_id
+
+        # The 'user_id' parameter is for long-term memory association
+        # (Memory Bank feature); creation failing means the session
+        # already exists in ADK, which is fine either way.
+        with contextlib.suppress(Exception):
             await self.agent_engine.async_create_session(
                 user_id=telegram_user_id, session_id=telegram_chat_id
             )
-            logger.warning(
-                f"Created new session ID ({telegram_chat_id}) for chat {telegram_chat_id}"
-            )
-            self._sessions.add(telegram_chat_id)
-        except Exception:
-            logger.warning(f"Session in ADKalready exists for chat {telegram_chat_id}")
-            self._sessions.add(telegram_chat_id)
+        logger.warning(
+            f"Ensured session ID ({telegram_chat_id}) for chat {telegram_chat_id}"
+        )
+
+        self._remember_session(telegram_chat_id)
+        if self.redis_client is not None:
+            with contextlib.suppress(Exception):
+                await self.redis_client.sadd(self._SESSIONS_KEY, telegram_chat_id)
 
         return telegram_chat_id
 
+    # Draft-flush cadence: edit the streamed draft at most this often, and
+    # only when this many new characters have arrived since the last edit.
+    _DRAFT_FLUSH_INTERVAL = 0.8
+    _DRAFT_FLUSH_MIN_CHARS = 200
+
     async def _process_agent_response(
         self,
         user_message: str,
@@ -229,49 +373,143 @@ class TelegramService:
         session_id: str,
         context: Any,
         chat_id: str,
-    ) -> tuple[str, int]:
+    ) -> tuple[str, int, int | None]:
         """Process agent response and return the accumulated text and event count.
 
+        While the agent streams, partial text is shown to the user as a
+        plain-text draft message that is edited on a debounced cadence, so
+        network I/O to Telegram overlaps with LLM generation instead of
+        everything waiting for the final reply.
+
         Args:
             user_message: The user message to process
             user_id: User identifier
             session_id: Session identifier
 
         Returns:
-            Tuple of (response_text, event_count)
+            Tuple of (response_text, event_count, draft_message_id) where
+            draft_message_id identifies the streamed draft to replace (or
+            None if no draft was sent)
         """
-        response_text = ""
+        # Parts are joined once at the end (and on draft flushes) instead of
+        # growing a string per streamed chunk
+        parts_buf: list[str] = []
+        total_len = 0
         event_count = 0
 
-        # Process streaming response from agent
-        async for event in self.agent_engine.async_stream_query(
+        draft_message_id: int | None = None
+        draft_enabled = True
+        last_flush = time.monotonic()
+        last_sent_len = 0
+        flush_task: asyncio.Task | None = None
+
+        status_message_id: int | None = None
+        status_enabled = True
+        status_task: asyncio.Task | None = None
+
+        async def _update_status(tool_name: str) -> None:
+            """Send or edit the single tool-status message."""
+            nonlocal status_message_id, status_enabled
+            try:
+                text = f"⚙️ The agent is using a tool: `{tool_name}`..."
+                if status_message_id is None:
+                    message = await context.bot.send_message(chat_id=chat_id, text=text)
+                    status_message_id = message.message_id
+                else:
+                    await context.bot.edit_message_text(
+                        chat_id=chat_id, message_id=status_message_id, text=text
+                    )
+            except Exception as status_error:
+                status_enabled = False
+                self.logger.debug(f"Status update failed, disabling: {status_error}")
+
+        async def _flush_draft(snapshot: str) -> None:
+            """Send or edit the draft message with the current text."""
+            nonlocal draft_message_id, draft_enabled
+            try:
+                # Telegram caps messages at 4096 chars; keep the head
+                snapshot = snapshot[:4096]
+                if draft_message_id is None:
+                    message = await context.bot.send_message(
+                        chat_id=chat_id, text=snapshot
+                    )
+                    draft_message_id = message.message_id
+                else:
+                    await context.bot.edit_message_text(
+                        chat_id=chat_id, message_id=draft_message_id, text=snapshot
+                    )
+            except Exception as flush_error:
+                # Streaming previews are best-effort; fall back to the
+                # single final reply rather than retrying mid-stream.
+                draft_enabled = False
+                self.logger.debug(f"Draft flush failed, disabling: {flush_error}")
+
+        # Process streaming response from agent. The stream is declared to
+        # yield dicts but the ADK yields Event instances; widen to Any so
+        # the isinstance dispatch below type-checks.
+        stream: AsyncIterable[Any] = self.agent_engine.async_stream_query(
             message=user_message,
             user_id=user_id,
             session_id=session_id,
-        ):
+        )
+        async for event in stream:
             try:
-                # Validate the event
-                validated_event = Event.model_validate(event)
-
-                if validated_event.get_function_calls():
-                    for call in validated_event.get_function_calls():
-                        # Immediately send a status update to the user
-                        await context.bot.send_message(
-                            chat_id=chat_id,
-                            text=f"⚙️ The agent is using a tool: `{call.name}`...",
+                # Skip Pydantic validation when the ADK already yields Event
+                # instances; only dict payloads need validating.
+                validated_event = (
+                    event if isinstance(event, Event) else Event.model_validate(event)
+                )
+
+                function_calls = validated_event.get_function_calls()
+                if function_calls:
+                    # Fire-and-forget status update (one message, edited in
+                    # place) so the stream keeps draining instead of
+                    # waiting one Telegram round-trip per tool call
+                    if status_enabled and (status_task is None or status_task.done()):
+                        status_task = asyncio.create_task(
+                            _update_status(function_calls[-1].name or "tool")
                         )
                 elif validated_event.content and validated_event.content.parts:
                     # This is the final LLM response text
                     for part in validated_event.content.parts:
                         if hasattr(part, "text") and part.text:
-                            response_text += part.text
+                            parts_buf.append(part.text)
+                            total_len += len(part.text)
                             event_count += 1
 
+                    # Debounced draft update; a single in-flight edit at a
+                    # time keeps us clear of Telegram rate limits.
+                    now = time.monotonic()
+                    if (
+                        draft_enabled
+                        and (flush_task is None or flush_task.done())
+                        and total_len - last_sent_len >= self._DRAFT_FLUSH_MIN_CHARS
+                        and now - last_flush >= self._DRAFT_FLUSH_INTERVAL
+                    ):
+                        flush_task = asyncio.create_task(
+                            _flush_draft("".join(parts_buf))
+                        )
+                        last_flush = now
+                        last_sent_len = total_len
+
             except Exception as event_error:
                 self.logger.warning(f"Error processing event {event}: {event_error}")
                 continue
 
-        return response_text, event_count
+        # Let any in-flight sends settle before the final reply
+        for pending in (flush_task, status_task):
+            if pending is not None and not pending.done():
+                with contextlib.suppress(Exception):
+                    await pending
+
+        # The tool-status message has served its purpose once the stream ends
+        if status_message_id is not None:
+            with contextlib.suppress(Exception):
+                await context.bot.delete_message(
+                    chat_id=chat_id, message_id=status_message_id
+                )
+
+        return "".join(parts_buf), event_count, draft_message_id
 
     async def start_command(
         self, update: Update, context: ContextTypes.DEFAULT_TYPE
@@ -282,19 +520,8 @@ class TelegramService:
             self.logger.warning("Update missing required attributes for start command")
             return
 
-        welcome_message = (
-            "👋 Welcome to BuySpy AI Assistant!\n\n"
-            "I'm here to help you with information and answer your questions. "
-            "Just send me a message and I'll do my best to assist you.\n\n"
-            "You can ask me about:\n"
-            "• Weather information\n"
-            "• Current time\n"
-            "• And much more!\n\n"
-            "What can I help you with today?"
-        )
-
         try:
-            await update.message.reply_text(welcome_message)
+            await update.message.reply_text(_WELCOME_MESSAGE)
             self.logger.info(f"Sent welcome message to user {update.effective_user.id}")
         except Exception as e:
             user_id = update.effective_user.id if update.effective_user else "unknown"
@@ -320,8 +547,16 @@ class TelegramService:
     def start_polling(self) -> None:
         """Start the bot polling loop."""
         try:
-            # Initialize the application first
-            self.application = Application.builder().token(self.bot_token).build()
+            # Initialize the application first. A wider persistent pool for
+            # outbound sends: every message costs at least two API calls
+            # (chat action + reply) plus per-tool status updates, and
+            # concurrent chats share the same pool.
+            self.application = (
+                Application.builder()
+                .token(self.bot_token)
+                .request(HTTPXRequest(connection_pool_size=32, pool_timeout=5))
+                .build()
+            )
 
             # Then set up handlers
             self.setup_handlers()
@@ -1,8 +1,26 @@
-from google.genai.types import HttpRetryOptions
+import functools
 
+from google.adk.models.google_llm import Gemini
+from google.genai.types import GenerateContentConfig, HttpRetryOptions
+
+# Narrow retries on transient errors only: with the agent fan-out, a wide
+# budget multiplies — exp_base=7 put the third retry at ~49s, so one flaky
+# call could stall a whole pricing batch. Jitter spreads simultaneous
+# retries from parallel extractions.
 default_retry_config = HttpRetryOptions(
-    attempts=5,  # Maximum retry attempts
-    exp_base=7,  # Delay multiplier
-    initial_delay=1,
+    attempts=3,  # Including the original request
+    initial_delay=0.5,
+    max_delay=4,
+    jitter=0.25,
     http_status_codes=[429, 500, 503, 504],  # Retry on these HTTP errors
 )
+
+# Shared generation config for agents that need nothing beyond the default
+# low temperature. Agents with schemas or tool configs build their own.
+default_gen_config = GenerateContentConfig(temperature=0.1)
+
+
+@functools.cache
+def get_gemini(model: str) -> Gemini:
+    """Memoized Gemini wrapper so agents on the same tier share one client."""
+    return Gemini(model=model, retry_options=default_retry_config)
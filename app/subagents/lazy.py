@@ -0,0 +1,67 @@
+"""Shared lazy-export plumbing for agent modules.
+
+Every agent module exposes its Agent and App through memoized getters and
+a PEP 562 module ``__getattr__``. That boilerplate was copy-pasted per
+module; this helper builds all three exports from two factory callables so
+each agent module reduces to its factory plus a single call.
+"""
+
+import threading
+from collections.abc import Callable
+from typing import Any
+
+from google.adk.agents import Agent
+from google.adk.apps.app import App
+
+
+def lazy_agent_exports(
+    agent_attr: str,
+    create_agent: Callable[[], Agent],
+    create_app: Callable[[Agent], App],
+) -> tuple[Callable[[], Agent], Callable[[], App], Callable[[str], Any]]:
+    """Build lazy (get_agent, get_app, __getattr__) exports for an agent module.
+
+    The returned getters construct the Agent/App on first use and memoize
+    them; the returned ``__getattr__`` serves the module-level names
+    (`agent_attr` and "app") so plain attribute access stays lazy.
+
+    Args:
+        agent_attr: Public module attribute name for the agent
+            (e.g. "research_agent")
+        create_agent: Factory building the Agent on first use
+        create_app: Factory wrapping the built agent in an App on first use
+
+    Returns:
+        Tuple of (get_agent, get_app, module __getattr__)
+    """
+    agent: Agent | None = None
+    app: App | None = None
+    # Construction may run on a pre-warm thread while the first request
+    # arrives; the lock guarantees a single instance either way. Reentrant
+    # because get_app() builds the agent while already holding it.
+    lock = threading.RLock()
+
+    def get_agent() -> Agent:
+        nonlocal agent
+        if agent is None:
+            with lock:
+                if agent is None:
+                    agent = create_agent()
+        return agent
+
+    def get_app() -> App:
+        nonlocal app
+        if app is None:
+            with lock:
+                if app is None:
+                    app = create_app(get_agent())
+        return app
+
+    def module_getattr(name: str) -> Any:
+        if name == agent_attr:
+            return get_agent()
+        if name == "app":
+            return get_app()
+        raise AttributeError(name)
+
+    return get_agent, get_app, module_getattr
@@ -1,67 +1,151 @@
+import asyncio
 import datetime
+import functools
 import os
 from typing import Any
 
-import google.auth
 from google.adk.agents import Agent
 from google.adk.apps.app import App, EventsCompactionConfig
-from google.adk.models.google_llm import Gemini
+from google.adk.apps.llm_event_summarizer import LlmEventSummarizer
+from google.adk.events.event import Event
 from google.adk.tools import AgentTool, load_memory
-from google.genai.types import GenerateContentConfig
 
-from app.subagents.config import default_retry_config
-from app.subagents.research.agent import research_agent
-from app.subagents.shopping.agent import shopping_agent
-from app.subagents.smalltalk.agent import smalltalk_agent
+from app.subagents.config import default_gen_config, get_gemini
+from app.subagents.lazy import lazy_agent_exports
+from app.subagents.research.agent import get_research_agent
+from app.subagents.response_cache import (
+    cache_lookup_callback,
+    cache_store_callback,
+)
+from app.subagents.shopping.agent import get_shopping_agent
+from app.subagents.smalltalk.agent import get_smalltalk_agent
+from app.tools.batch import find_prices_batch
+from app.tools.pipeline import research_with_prices
+from app.tools.research_cache import (
+    research_cache_lookup,
+    research_cache_store,
+)
+from app.tools.shopping_result_cache import (
+    shopping_result_cache_lookup,
+    shopping_result_cache_store,
+)
+
+# Environment defaults applied once by _initialize_google_auth.
+_ENV_DEFAULTS = {
+    "GOOGLE_CLOUD_LOCATION": "global",
+    "GOOGLE_GENAI_USE_VERTEXAI": "True",
+}
 
 
+@functools.lru_cache(maxsize=1)
 def _initialize_google_auth() -> str:
-    """Initialize Google Auth and return the project ID."""
-    _, project_id = google.auth.default()
-    os.environ.setdefault("GOOGLE_CLOUD_PROJECT", project_id)
-    os.environ.setdefault("GOOGLE_CLOUD_LOCATION", "global")
-    os.environ.setdefault("GOOGLE_GENAI_USE_VERTEXAI", "True")
+    """Initialize Google Auth and return the project ID.
+
+    Cached so repeated agent construction pays for the ADC/metadata-server
+    probe only once per process. When GOOGLE_CLOUD_PROJECT is already set
+    (Cloud Run/GKE), the `google.auth.default()` round trip is skipped
+    entirely.
+    """
+    if "GOOGLE_CLOUD_PROJECT" in os.environ:
+        project_id = os.environ["GOOGLE_CLOUD_PROJECT"]
+    else:
+        # Deferred import: google.auth is only needed on the ADC fallback
+        # path, and this module is imported on every worker start.
+        import google.auth
+
+        _, project_id = google.auth.default()
+        os.environ["GOOGLE_CLOUD_PROJECT"] = project_id
+    # One bulk update instead of per-key setdefault calls; together with the
+    # lru_cache guard, nothing touches the environment after the first call.
+    os.environ.update(
+        {key: value for key, value in _ENV_DEFAULTS.items() if key not in os.environ}
+    )
     return project_id
 
 
+# Compaction windows whose text is below this many characters (~8k tokens at
+# ~4 chars/token) are left uncompacted: the summarization LLM call would cost
+# more than the prefill it saves. A character proxy instead of a count_tokens
+# RPC, which would itself add a round trip per check.
+_COMPACTION_MIN_CHARS = 32_000
+
+
+class _TokenGatedSummarizer(LlmEventSummarizer):
+    """Event summarizer that skips windows too small to be worth compacting.
+
+    Returning None leaves the window uncompacted; the sliding-window logic
+    retries with a larger window on a later turn, so long sessions still
+    get compacted before context growth compounds.
+    """
+
+    async def maybe_summarize_events(self, *, events: list[Event]) -> Event | None:
+        total_chars = sum(
+            len(part.text)
+            for event in events
+            if event.content and event.content.parts
+            for part in event.content.parts
+            if part.text
+        )
+        if total_chars < _COMPACTION_MIN_CHARS:
+            return None
+        return await super().maybe_summarize_events(events=events)
+
+
+def token_gated_summarizer(agent: Agent) -> LlmEventSummarizer:
+    """Build the size-gated compaction summarizer for an App wrapping `agent`.
+
+    Exported so every App around the root agent (the deployed one in
+    app.agent as well as the playground one below) shares the gate;
+    without an explicit summarizer ADK falls back to the ungated default.
+    """
+    return _TokenGatedSummarizer(llm=agent.canonical_model)
+
+
+# Memory writes in flight; holding a reference keeps them from being GC'd
+# before they complete.
+_memory_tasks: set[asyncio.Task] = set()
+
+# Only this many trailing events are written to memory each turn. Saving the
+# whole session makes the bytes written grow quadratically over a
+# conversation; the recent window plus session state carries what recall
+# actually uses.
+_MEMORY_EVENT_WINDOW = 6
+
+
 async def _auto_save_to_memory(callback_context: Any) -> None:
-    """Automatically save session to memory after each agent turn."""
-    await callback_context._invocation_context.memory_service.add_session_to_memory(
-        callback_context._invocation_context.session
+    """Save the session to memory without blocking the response.
+
+    The write's result is never consumed by the turn, so it runs as a
+    background task instead of adding the memory-service round trip to
+    every response's critical path. Only the trailing event window is
+    saved; earlier events were already written on previous turns.
+    """
+    session = callback_context._invocation_context.session
+    if len(session.events) > _MEMORY_EVENT_WINDOW:
+        session = session.model_copy(
+            update={"events": session.events[-_MEMORY_EVENT_WINDOW:]}
+        )
+    task = asyncio.create_task(
+        callback_context._invocation_context.memory_service.add_session_to_memory(
+            session
+        )
     )
+    _memory_tasks.add(task)
+    task.add_done_callback(_memory_tasks.discard)
 
 
-def _create_root_agent() -> Agent:
-    """Create the root agent that coordinates the subagents."""
+async def drain_memory_tasks() -> None:
+    """Await outstanding memory writes (shutdown hook, also used by tests)."""
+    if _memory_tasks:
+        await asyncio.gather(*_memory_tasks, return_exceptions=True)
 
-    _initialize_google_auth()
 
-    current_date_str = datetime.datetime.now().strftime("%Y-%m-%d")
-    current_year = datetime.datetime.now().strftime("%Y")
-
-    return Agent(
-        name="root_agent",
-        model=Gemini(model="gemini-2.5-flash", retry_options=default_retry_config),
-        # Root only has access to the sub-agents
-        tools=[
-            AgentTool(research_agent),
-            AgentTool(shopping_agent),
-            AgentTool(smalltalk_agent),
-            load_memory,
-        ],
-        after_agent_callback=_auto_save_to_memory,
-        generate_content_config=GenerateContentConfig(
-            temperature=0.1,
-        ),
-        instruction=f"""You are BuySpy, your friendly and intelligent shopping companion!
+# Built once at import; the factory only formats in the date context so the
+# large static block stays byte-identical across constructions.
+_ROOT_INSTRUCTION_TMPL = """You are BuySpy, your friendly and intelligent shopping companion!
 
 I'm here to help you find the best deals and recommendations with style and clarity.
 
-### CONTEXT
-- **Date:** {current_date_str}
-- **Year:** {current_year}
-- **Rule:** Do not ask the user for the year. Assume current year models.
-
 ### OUTPUT FORMATTING
 Use Markdown V2 formatting and emojis for better UX:
 
@@ -147,6 +231,12 @@ Analyze the user's query to determine intent:
 
 **STEP 3: EXECUTION** (Only for Shopping/Product Intent)
 
+- **Scenario A0: Recommendations AND Prices in one message ("Best headphones with prices")**
+  1. Call `research_with_prices(query="[User Query]", country="[Country Name]")` ONCE.
+  2. It researches, then prices every recommended model in parallel — no
+     separate research_agent / pricing calls needed.
+  3. Present the combined recommendations + prices (see STEP 4 formatting).
+
 - **Scenario A: Recommendation Request ("Best headphones?")**
   1. Call `research_agent` with: "Research [User Query] for [Country Name]"
   2. **Parse JSON Output:** Extract the list of recommendations with "model" and "reason" fields.
@@ -157,9 +247,10 @@ Analyze the user's query to determine intent:
   5. **WAIT for user response.**
   6. **After user responds:**
      - Parse which models they want (specific models or "all")
-     - Call `shopping_agent` IN PARALLEL for all selected models
-     - Input for each: `"[Model Name] price in [Country Name]"`
-  7. **Parse Shopping Results:** Each shopping_agent returns a JSON object with "product", "country", "results", and "total_found".
+     - Call `find_prices_batch` ONCE with all selected models:
+       `find_prices_batch(products=["Model 1", "Model 2"], country="[Country Name]")`
+     - It looks up all products in parallel and returns one result per model.
+  7. **Parse Shopping Results:** Each entry is a JSON object with "product", "country", "results", and "total_found".
   8. **Combine & Present:** Merge the "reason" and "link" (from Research) with the "results" array (from Shopping) for each selected product.
 
 - **Scenario B: Specific Product Request**
@@ -186,48 +277,79 @@ For each product with pricing data:
 **IMPORTANT NOTES:**
 - DO NOT automatically call shopping_agent after research_agent.
 - ALWAYS ask the user which models they want pricing for after showing recommendations.
-- Only call shopping_agent for MULTIPLE products IN PARALLEL after user confirms their selection.
+- For MULTIPLE products, call `find_prices_batch` ONCE after user confirms their selection — never loop shopping_agent per model.
 - Parse JSON outputs carefully from both agents.
 - Handle cases where products may not be available in the specified country.
 - For general intent queries, delegate completely to smalltalk_agent - it has a funny, witty personality for engaging conversations.
 
-**Example Output - General Intent:**
-```
-User: "What is the capital of Finland?"
-→ Delegate to smalltalk_agent
-smalltalk_agent response: "Helsinki! Fun fact: It's also the northernmost capital city of an EU member state. Imagine trying to explain seasons to someone who lives there during the midnight sun season! ☀️❄️"
-```
-
-**Example Output - Shopping Intent:**
-```
-🌍 Which country are you shopping in?
+**Example - General Intent:** "What is the capital of Finland?" → delegate to smalltalk_agent and relay its witty answer.
 
-🔍 *Research Results for Finland*
+**Example - Shopping Intent:** "Best headphones?" → ask the country if unknown, show 🎯 numbered recommendations with 💡 reasons, then ask which models to price. 💰
 
-🎯 *Top Recommendations:*
+### CONTEXT
+- **Date:** {current_date_str}
+- **Year:** {current_year}
+- **Rule:** Do not ask the user for the year. Assume current year models.
 
-1. *Sony WH-1000XM6*
-   💡 _Best overall noise-cancelling headphones with excellent active noise cancelling and features_
+Start.
+"""
 
-2. *Bose QuietComfort Ultra Headphones (2nd Gen)*
-   💡 _Excellent active noise cancelling performance, comfortable for long wear, and a strong contender for best travel headphones_
 
-Would you like me to find prices for these? 💰
-```
+def _root_instruction(_context: Any) -> str:
+    """Render the root instruction with the date resolved at request time.
 
-Start.
-""",
+    An instruction provider instead of a baked string: a long-lived
+    process keeps a correct date without rebuilding the agent, and only
+    the small context block at the template tail ever changes.
+    """
+    now = datetime.datetime.now()
+    return _ROOT_INSTRUCTION_TMPL.format(
+        current_date_str=now.strftime("%Y-%m-%d"),
+        current_year=now.year,
     )
 
 
-# Global root agent instance
-root_agent = _create_root_agent()
+def _create_root_agent() -> Agent:
+    """Create the root agent that coordinates the subagents."""
+
+    _initialize_google_auth()
+
+    return Agent(
+        name="root_agent",
+        model=get_gemini("gemini-2.5-flash"),
+        # Root only has access to the sub-agents. Keep this ordering stable:
+        # Gemini prompt-prefix caching needs byte-identical tool schemas
+        # across calls.
+        tools=[
+            AgentTool(get_research_agent()),
+            AgentTool(get_shopping_agent()),
+            AgentTool(get_smalltalk_agent()),
+            find_prices_batch,
+            research_with_prices,
+            load_memory,
+        ],
+        after_agent_callback=_auto_save_to_memory,
+        before_model_callback=cache_lookup_callback,
+        after_model_callback=cache_store_callback,
+        before_tool_callback=[research_cache_lookup, shopping_result_cache_lookup],
+        after_tool_callback=[research_cache_store, shopping_result_cache_store],
+        generate_content_config=default_gen_config,
+        instruction=_root_instruction,
+    )
+
 
-app = App(
-    root_agent=root_agent,
-    name="orchestrator",
-    events_compaction_config=EventsCompactionConfig(
-        compaction_interval=5,  # Trigger compaction every 3 invocations
-        overlap_size=1,  # Keep 1 previous turn for context
+# Lazy-loaded root agent and app instances (PEP 562): Google auth and full
+# agent construction only happen on first access.
+get_root_agent, get_app, __getattr__ = lazy_agent_exports(
+    "root_agent",
+    _create_root_agent,
+    lambda agent: App(
+        root_agent=agent,
+        name="orchestrator",
+        events_compaction_config=EventsCompactionConfig(
+            compaction_interval=5,  # Trigger compaction every 5 invocations
+            overlap_size=1,  # Keep 1 previous turn for context
+            summarizer=token_gated_summarizer(agent),
+        ),
     ),
 )
@@ -1,6 +1,7 @@
+from typing import Any
+
 from google.adk.agents import Agent
 from google.adk.apps.app import App
-from google.adk.models.google_llm import Gemini
 from google.genai.types import (
     FunctionCallingConfig,
     FunctionCallingConfigMode,
@@ -9,8 +10,17 @@ from google.genai.types import (
 )
 from pydantic import BaseModel, Field
 
-from app.subagents.config import default_retry_config
-from app.tools.search_tools_bd import brightdata_toolset
+from app.subagents.config import get_gemini
+from app.subagents.lazy import lazy_agent_exports
+from app.tools.price_extract import (
+    annotate_prices,
+    derive_store_name,
+    is_aggregator,
+)
+from app.tools.scrape_cache import scrape_cache_lookup, scrape_cache_store
+from app.tools.scrape_trim import map_scrape_text, trim_scraped_markdown
+from app.tools.search_tools_bd import get_brightdata_toolset
+from app.tools.throttle import throttle_brightdata
 
 
 class PriceExtractorInput(BaseModel):
@@ -25,22 +35,26 @@ class PriceExtractorInput(BaseModel):
     product_name: str = Field(description="The name of the product for context.")
 
 
-def _create_price_extractor_agent() -> Agent:
-    """Scrapes a single URL and extracts price data."""
-    return Agent(
-        name="price_extractor_agent",
-        model=Gemini(model="gemini-2.5-flash-lite", retry_options=default_retry_config),
-        tools=[brightdata_toolset],
-        input_schema=PriceExtractorInput,
-        generate_content_config=GenerateContentConfig(
-            temperature=0.1,  # More deterministic
-            tool_config=ToolConfig(
-                function_calling_config=FunctionCallingConfig(
-                    mode=FunctionCallingConfigMode.AUTO
-                )
-            ),
-        ),
-        instruction="""You are a Price Data Extractor Agent.
+class PriceResult(BaseModel):
+    """
+    Structured result produced by the price extractor agent.
+    """
+
+    price: float | None = Field(
+        None, description="Extracted price, null when extraction failed"
+    )
+    currency: str | None = Field(None, description="Currency code, e.g. EUR")
+    store: str | None = Field(None, description="Store display name")
+    url: str | None = Field(None, description="Original input URL")
+    status: str | None = Field(None, description="Availability status")
+    tier: int | None = Field(None, description="Priority tier from the input")
+    error: str | None = Field(
+        None, description="Short failure reason when extraction failed"
+    )
+
+
+# Built once at import; static across all constructions.
+_PRICE_EXTRACTOR_INSTRUCTION = """You are a Price Data Extractor Agent.
 
 **INPUT FORMAT (JSON):**
 ```json
@@ -63,13 +77,13 @@ def _create_price_extractor_agent() -> Agent:
 
 ### Step 1: Scrape (MANDATORY)
 Call `scrape_as_markdown(url)` with the provided URL.
-- If scraping fails or returns empty content → return `null`
+- If scraping fails or returns empty content → return a failure result (see Step 5)
 - If successful → proceed to analysis
 
 ### Step 2: Detect Page Type
 
 **AGGREGATOR/Price Comparison Site:**
-1. **Known domains:** hinta.fi, hintaopas.fi, hintaseuranta.fi, vertaa.fi, idealo.de, pricerunner.com, geizhals.de, prisjakt.nu
+1. **Pre-extracted hint:** `page type: aggregator` in the hints means the domain is a known comparison site — treat as aggregator
 2. **Multiple prices in tables/lists:** Page shows the SAME product with DIFFERENT prices from DIFFERENT stores
 3. **Patterns:** Tables with columns like "Shop Name | Price | Stock | Link"
 4. **Purpose:** Comparing prices, not selling directly
@@ -119,8 +133,8 @@ Extract:
 - Symbols: € → EUR, $ → USD, £ → GBP
 
 **C. STORE NAME**
-- Extract from page title, header, or URL domain
-- If from URL domain, format: `verkkokauppa.com` → `Verkkokauppa.com`, capitalize properly, remove `www.`
+- Prefer the `store (from URL domain)` value from the pre-extracted hints when present
+- Otherwise extract from page title or header
 
 **D. AVAILABILITY**
 Search for keywords:
@@ -136,37 +150,24 @@ Search for keywords:
 Check if the page is about the correct product:
 - Compare `product_name` with product title/heading
 - Key identifiers: brand name, model number
-- If clearly a different product → return `null`
+- If clearly a different product → return a failure result (see Step 5)
 
 ### Step 5: Return Result
 
-**Preferred format (clean JSON):**
+Output is constrained to the result JSON schema:
 ```json
-{"price": 129.90, "currency": "EUR", "store": "Verkkokauppa.com", "url": "https://hinta.fi/...", "status": "In Stock", "tier": 1}
-```
-
-**Alternative (with brief reasoning):**
+{"price": 129.90, "currency": "EUR", "store": "Verkkokauppa.com", "url": "https://hinta.fi/...", "status": "In Stock", "tier": 1, "error": null}
 ```
-Found Philips TAH9505 on aggregator. Lowest price: Verkkokauppa.com at 129.90 EUR.
 
-{"price": 129.90, "currency": "EUR", "store": "Verkkokauppa.com", "url": "https://hinta.fi/...", "status": "In Stock", "tier": 1}
-```
-
-**If failed:**
-```
-null
-```
-
-Or:
-```
-FAILED: Unable to scrape
+**If failed:** set `error` to a short reason and leave the other fields null:
+```json
+{"price": null, "currency": null, "store": null, "url": null, "status": null, "tier": null, "error": "Unable to scrape"}
 ```
 
 ## KEY RULES
 - Always scrape first
 - Use original input URL in output (never shop links)
 - Price must be float, not string
-- Return JSON at the end (with or without reasoning)
 
 ## EXAMPLES
 
@@ -177,7 +178,7 @@ After scraping: "Philips TAH9505 ... 129,90 € ... Varastossa"
 
 Output:
 ```json
-{"price": 129.90, "currency": "EUR", "store": "Verkkokauppa.com", "url": "https://verkkokauppa.com/fi/product/123", "status": "In Stock", "tier": 1}
+{"price": 129.90, "currency": "EUR", "store": "Verkkokauppa.com", "url": "https://verkkokauppa.com/fi/product/123", "status": "In Stock", "tier": 1, "error": null}
 ```
 
 **Example 2 - Aggregator:**
@@ -191,19 +192,70 @@ After scraping, table shows:
 
 Output:
 ```json
-{"price": 129.90, "currency": "EUR", "store": "Verkkokauppa.com", "url": "https://hinta.fi/2162671/philips-tah9505", "status": "In Stock", "tier": 1}
+{"price": 129.90, "currency": "EUR", "store": "Verkkokauppa.com", "url": "https://hinta.fi/2162671/philips-tah9505", "status": "In Stock", "tier": 1, "error": null}
 ```
 
 **Example 3 - Failed:**
-Output: `null`
-""",
-    )
+Output: `{"price": null, "currency": null, "store": null, "url": null, "status": null, "tier": null, "error": "Unable to scrape"}`
+"""
+
+
+def _post_process_scrape(
+    tool: Any, args: dict[str, Any], tool_context: Any, tool_response: Any
+) -> Any | None:
+    """Trim and annotate scrapes before the model sees them, then cache.
 
+    Composes the steps explicitly so the cache stores the same bounded,
+    annotated payload the model receives. The store name is derived from
+    the scraped URL in Python and attached as a hint so the model does not
+    reformat the domain itself.
+    """
+    url = args.get("url", "") if isinstance(args, dict) else ""
+    store = derive_store_name(url)
+    aggregator = is_aggregator(url)
+
+    def _prepare(text: str) -> str:
+        return annotate_prices(
+            trim_scraped_markdown(text), store=store, aggregator=aggregator
+        )
+
+    processed = map_scrape_text(tool_response, _prepare)
+    effective_response = processed if processed is not None else tool_response
+    scrape_cache_store(tool, args, tool_context, effective_response)
+    return processed
+
+
+def _create_price_extractor_agent() -> Agent:
+    """Scrapes a single URL and extracts price data."""
+    return Agent(
+        name="price_extractor_agent",
+        model=get_gemini("gemini-2.5-flash-lite"),
+        tools=[get_brightdata_toolset()],
+        input_schema=PriceExtractorInput,
+        # Cache hits short-circuit before the throttle, so only real
+        # fetches consume rate-limit tokens.
+        before_tool_callback=[scrape_cache_lookup, throttle_brightdata],
+        after_tool_callback=_post_process_scrape,
+        generate_content_config=GenerateContentConfig(
+            temperature=0.1,  # More deterministic
+            # Output is a one-line PriceResult; the bound stops pathological
+            # generations from running up latency and cost.
+            max_output_tokens=512,
+            response_mime_type="application/json",
+            response_json_schema=PriceResult.model_json_schema(),
+            tool_config=ToolConfig(
+                function_calling_config=FunctionCallingConfig(
+                    mode=FunctionCallingConfigMode.AUTO
+                )
+            ),
+        ),
+        instruction=_PRICE_EXTRACTOR_INSTRUCTION,
+    )
 
-# Global price_extractor_agent instance
-price_extractor_agent = _create_price_extractor_agent()
 
-app = App(
-    root_agent=price_extractor_agent,
-    name="price_extractor",
+# Lazy-loaded price extractor agent and app instances (PEP 562)
+get_price_extractor_agent, get_app, __getattr__ = lazy_agent_exports(
+    "price_extractor_agent",
+    _create_price_extractor_agent,
+    lambda agent: App(root_agent=agent, name="price_extractor"),
 )
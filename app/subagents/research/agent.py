@@ -1,13 +1,14 @@
 from datetime import datetime
+from typing import Any
 
 from google.adk.agents import Agent
 from google.adk.apps.app import App
-from google.adk.models.google_llm import Gemini
 from google.adk.tools.google_search_tool import google_search
 from google.genai.types import GenerateContentConfig
 from pydantic import BaseModel, Field
 
-from app.subagents.config import default_retry_config
+from app.subagents.config import get_gemini
+from app.subagents.lazy import lazy_agent_exports
 
 
 class ResearchResult(BaseModel):
@@ -15,22 +16,12 @@ class ResearchResult(BaseModel):
     reason: str = Field(..., description="Reason for recommendation")
 
 
-def _create_research_agent(current_year: str) -> Agent:
-    return Agent(
-        name="research_agent",
-        model=Gemini(model="gemini-2.5-flash-lite", retry_options=default_retry_config),
-        tools=[google_search],
-        generate_content_config=GenerateContentConfig(
-            temperature=0.1,
-            response_mime_type="application/json",
-            response_json_schema=ResearchResult.model_json_schema(),
-        ),
-        instruction=f"""You are a Regional Product Research Specialist.
+# Built once at import; the provider only formats in the year, at the
+# template tail so the static prefix stays byte-identical across requests.
+_RESEARCH_INSTRUCTION_TMPL = """You are a Regional Product Research Specialist.
 
 **Input:** "Research [Category] for [Country Name]"
 
-Use {current_year} as default year if not specified.
-
 ### YOUR JOB
 1. Search for "Best [Category] [Country Name] [Year]"
 2. Find 1-5 top recommended models
@@ -52,14 +43,38 @@ Example:
   }}
 ]
 ```
-""",
-    )
 
+### CONTEXT
+- **Year:** {current_year} — use as the default year if not specified.
+"""
+
+
+def _research_instruction(_context: Any) -> str:
+    """Render the research instruction with the year resolved at request time.
+
+    An instruction provider instead of a baked string: a long-lived
+    process keeps a correct year without rebuilding the agent.
+    """
+    return _RESEARCH_INSTRUCTION_TMPL.format(current_year=datetime.now().year)
+
+
+def _create_research_agent() -> Agent:
+    return Agent(
+        name="research_agent",
+        model=get_gemini("gemini-2.5-flash-lite"),
+        tools=[google_search],
+        generate_content_config=GenerateContentConfig(
+            temperature=0.1,
+            response_mime_type="application/json",
+            response_json_schema=ResearchResult.model_json_schema(),
+        ),
+        instruction=_research_instruction,
+    )
 
-# Global research agent instance
-research_agent = _create_research_agent(current_year=str(datetime.now().year))
 
-app = App(
-    root_agent=research_agent,
-    name="research",
+# Lazy-loaded research agent and app instances (PEP 562)
+get_research_agent, get_app, __getattr__ = lazy_agent_exports(
+    "research_agent",
+    _create_research_agent,
+    lambda agent: App(root_agent=agent, name="research"),
 )
@@ -0,0 +1,114 @@
+"""In-process response cache for the root agent.
+
+Repeated shopping queries ("best headphones in Finland" asked twice in a
+row) otherwise pay a full Gemini round trip each time. This module keeps a
+small TTL-bounded cache of final model responses keyed by the normalized
+last user message and serves hits through a ``before_model_callback``,
+short-circuiting the model call entirely.
+
+Only opening turns are cached: the request must consist of exactly one
+plain-text user message, so context-dependent follow-ups ("all of them",
+"yes, the first one") never leak between conversations. Responses that
+carry function calls are never stored — on a delegating agent the first
+model turn is a transfer, not an answer.
+"""
+
+import re
+import time
+from typing import Any
+
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+
+# Cache entries expire after this many seconds; shopping prices go stale fast.
+_CACHE_TTL_SECONDS = 300.0
+
+# Bound memory: oldest entries are evicted once the cache exceeds this size.
+_MAX_ENTRIES = 256
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+# key -> (expiry timestamp, cached response)
+_cache: dict[str, tuple[float, LlmResponse]] = {}
+
+# invocation_id -> cache key computed by the before-model callback, so the
+# after-model callback stores the response under the same key.
+_pending_keys: dict[str, str] = {}
+
+
+def _normalize(text: str) -> str:
+    """Normalize a query so trivial paraphrases collapse to one key."""
+    return _WHITESPACE_RE.sub(" ", text.strip().lower())
+
+
+def _cache_key(llm_request: LlmRequest) -> str | None:
+    """Build a cache key for a single-message plain-text request.
+
+    Returns None (no caching) when the request carries any history beyond
+    one user message, or when that message has function responses or other
+    non-text parts. Keying anything longer on the last message alone would
+    replay one conversation's follow-up answers into another.
+    """
+    contents = llm_request.contents or []
+    if len(contents) != 1:
+        return None
+    content = contents[0]
+    if content.role != "user" or not content.parts:
+        return None
+    texts: list[str] = []
+    for part in content.parts:
+        if getattr(part, "function_response", None) is not None:
+            return None
+        text = getattr(part, "text", None)
+        if text:
+            texts.append(text)
+    if not texts:
+        return None
+    return f"{llm_request.model}:{_normalize(' '.join(texts))}"
+
+
+def cache_lookup_callback(
+    callback_context: Any, llm_request: LlmRequest
+) -> LlmResponse | None:
+    """`before_model_callback`: return a cached response on hit, else None."""
+    key = _cache_key(llm_request)
+    if key is None:
+        return None
+    entry = _cache.get(key)
+    if entry is not None:
+        expires_at, response = entry
+        if time.monotonic() <= expires_at:
+            return response
+        _cache.pop(key, None)
+    # Miss: remember the key so the after-model callback can populate it.
+    _pending_keys[callback_context.invocation_id] = key
+    return None
+
+
+def cache_store_callback(
+    callback_context: Any, llm_response: LlmResponse
+) -> LlmResponse | None:
+    """`after_model_callback`: store complete final answers for later reuse.
+
+    Responses containing function calls are skipped: they are tool-loop
+    turns, and replaying one as a "response" would short-circuit the model
+    with half a conversation.
+    """
+    key = _pending_keys.pop(callback_context.invocation_id, None)
+    if key is None:
+        return None
+    if llm_response.partial or llm_response.content is None:
+        return None
+    for part in llm_response.content.parts or []:
+        if getattr(part, "function_call", None) is not None:
+            return None
+    if len(_cache) >= _MAX_ENTRIES:
+        _cache.pop(next(iter(_cache)))
+    _cache[key] = (time.monotonic() + _CACHE_TTL_SECONDS, llm_response)
+    return None
+
+
+def clear_cache() -> None:
+    """Drop all cached responses (used by tests)."""
+    _cache.clear()
+    _pending_keys.clear()
@@ -1,13 +1,14 @@
 from google.adk.agents import Agent
 from google.adk.apps.app import App
-from google.adk.models.google_llm import Gemini
-from google.adk.tools import AgentTool
 from google.genai.types import GenerateContentConfig
 from pydantic import BaseModel, Field
 
-from app.subagents.config import default_retry_config
-from app.subagents.price_extractor.agent import price_extractor_agent
-from app.tools.search_tools_bd import brightdata_toolset
+from app.subagents.config import get_gemini
+from app.subagents.lazy import lazy_agent_exports
+from app.tools.extract_batch import extract_prices_parallel
+from app.tools.search_tools_bd import get_brightdata_toolset
+from app.tools.throttle import throttle_brightdata
+from app.tools.url_ranker import filter_and_rank_urls
 
 
 class Product(BaseModel):
@@ -26,18 +27,8 @@ class ShoppingResult(BaseModel):
     error: str | None = Field(None, description="Error message if any")
 
 
-def _create_shopping_agent(price_extractor_agent: Agent) -> Agent:
-    """Uses BrightData SERP search and web crawler to find and verify product prices."""
-    return Agent(
-        name="shopping_agent",
-        model=Gemini(model="gemini-2.5-flash", retry_options=default_retry_config),
-        tools=[brightdata_toolset, AgentTool(price_extractor_agent)],
-        generate_content_config=GenerateContentConfig(
-            temperature=0.1,
-            response_mime_type="application/json",
-            response_json_schema=ShoppingResult.model_json_schema(),
-        ),
-        instruction="""You are a Price Search Engine using BrightData.
+# Built once at import; static across all constructions.
+_SHOPPING_INSTRUCTION = """You are a Price Search Engine using BrightData.
 
 ## AVAILABLE TOOLS
 
@@ -46,16 +37,16 @@ You have access to EXACTLY these tools:
 2. **scrape_as_markdown** - Fetch webpage content (from brightdata_toolset)
 3. **search_engine_batch** - Batch search queries (from brightdata_toolset)
 4. **scrape_batch** - Batch scrape URLs (from brightdata_toolset)
-5. **price_extractor_agent** - Delegate ONE URL at a time to specialized agent
+5. **extract_prices_parallel** - Extract prices from ALL selected URLs in ONE call
+6. **filter_and_rank_urls** - Filter, deduplicate, and tier-rank the SERP URLs in ONE call
 
 **CRITICAL TOOL USAGE RULES:**
 - For Step 1 (SERP search): ONLY use `search_engine` tool
-- For Steps 2-3 (filtering, prioritizing): Do this logic yourself (no tools needed)
-- For Step 4 (price extraction): Call `price_extractor_agent` MULTIPLE TIMES IN PARALLEL
-  - **ONE CALL PER URL** - Do NOT batch URLs together
-  - **DO NOT** send `{"urls": [...]}` - that's wrong
-  - **DO** call the tool separately for each URL: `price_extractor_agent(url="...", tier=1, product_name="...")`
-- DO NOT use `scrape_as_markdown` yourself - delegate to `price_extractor_agent`
+- For Steps 2-3 (filtering, prioritizing): Call `filter_and_rank_urls` ONCE - do NOT do this logic yourself
+- For Step 4 (price extraction): Call `extract_prices_parallel` ONCE with every selected URL
+  - `extract_prices_parallel(urls=[...], tiers=[...], product_name="...")`
+  - The fan-out and parallelism happen in code - do NOT call it per URL
+- DO NOT use `scrape_as_markdown` yourself - extraction is delegated internally
 
 **TASK:** Find the 5 best available prices for "[Product Name] in [Country Name]"
 **Input:** [Product Name] price in [Country Name]
@@ -68,61 +59,49 @@ You have access to EXACTLY these tools:
 - For non-English countries (Finland→Finnish, Germany→German, etc.), translate generic terms but keep brand names and model numbers unchanged
   - Example: "Sony WH-CH520 wireless headphones" → "Sony WH-CH520 langattomat kuulokkeet"
 
-### 2. Filter & Deduplicate URLs (YOUR LOGIC - NO TOOLS)
-From SERP results:
-- **Remove:** Search engines (google.com, bing.com, yandex.ru), social media, forums, blogs, news sites
-- **Deduplicate:** Keep only ONE link per shop domain (e.g., if 3 amazon.de links, keep the most relevant product page)
-- **Extract domain:** "https://www.verkkokauppa.com/fi/product/123" → domain is "verkkokauppa.com"
-
-### 3. Prioritize URLs (YOUR LOGIC - NO TOOLS)
-From filtered URLs (target: 3-7 unique shops), assign priority tiers:
-- **Tier 1:** Official stores, major local retailers, country price comparison sites
-- **Tier 2:** International retailers with country sites (amazon.de, amazon.fi)
-- **Tier 3:** Generic international sites (amazon.com, ebay.com)
+### 2-3. Filter, Deduplicate & Prioritize (CALL filter_and_rank_urls ONCE)
 
-Sort URLs: Tier (1>2>3) → Domain (alphabetically) → Path (alphabetically)
+Call `filter_and_rank_urls(urls=[...all SERP result URLs...], country="[Country Name]")`.
 
-### 4. Extract Prices in Parallel (CALL price_extractor_agent MULTIPLE TIMES)
+It removes non-shop domains (search engines, social media, forums, reference
+sites), keeps one URL per shop domain, assigns priority tiers
+(**Tier 1:** local stores and price-comparison sites, **Tier 2:** international
+retailers with country sites, **Tier 3:** generic international sites), and
+returns `[{"url": ..., "tier": ...}, ...]` already deterministically sorted
+by Tier (1>2>3) → Domain → Path.
 
-**CRITICAL: Call the tool ONCE PER URL, not once for all URLs!**
+Take the first 3-7 entries for extraction.
 
-For EACH of the first 3-7 sorted URLs, make a SEPARATE tool call:
+### 4. Extract Prices (CALL extract_prices_parallel ONCE)
 
-**CORRECT - One call per URL:**
-```
-Call 1: price_extractor_agent(url="https://shop1.com/product", tier=1, product_name="Sony WH-CH520")
-Call 2: price_extractor_agent(url="https://shop2.fi/item", tier=1, product_name="Sony WH-CH520")
-Call 3: price_extractor_agent(url="https://shop3.com/page", tier=2, product_name="Sony WH-CH520")
-... (continue for each URL)
-```
+Make ONE tool call with the first 3-7 sorted URLs:
 
-**WRONG - Don't do this:**
 ```
-price_extractor_agent(urls=[...], product_name="...")  ❌ NEVER BATCH URLS
+extract_prices_parallel(
+    urls=["https://shop1.com/product", "https://shop2.fi/item", "https://shop3.com/page"],
+    tiers=[1, 1, 2],
+    product_name="Sony WH-CH520",
+)
 ```
 
-**Parameters for each call:**
-- `url`: String - The single URL to scrape
-- `tier`: Integer (1, 2, or 3) - Priority tier for this URL
+**Parameters:**
+- `urls`: List of strings - The sorted URLs to extract from
+- `tiers`: List of integers (1, 2, or 3) - Priority tier for each URL, same order as `urls`
 - `product_name`: String - Product name for verification
 
-Execute all calls **IN PARALLEL** (don't wait for one to finish before starting the next).
-Each price_extractor_agent call returns either:
-1. Clean JSON: `{"price": 129.90, ...}`
-2. Reasoning + JSON: `Some text... {"price": 129.90, ...}`
-3. Failure: `null` or `FAILED: reason`
+The tool runs every extraction concurrently in code and returns one result
+per URL, in input order. Each result is schema-constrained JSON:
+1. Success: `{"price": 129.90, ..., "error": null}`
+2. Failure: `{"price": null, ..., "error": "reason"}`
 
 Parse responses by:
-- Extracting JSON objects (look for `{"price":` pattern)
-- Ignoring null/FAILED responses
-- If JSON found anywhere in text, extract it
+- Treating a non-null `error` or null `price` as a failed extraction
+- Ignoring failed extractions
 
 ### 5. Collect Results
-Wait for all parallel extractions to complete. Collect all non-null results.
-**CRITICAL:** Some agents may fail, return "Error", return "Resource Exhausted", or return null.
-- **IGNORE** any result that is not valid JSON.
-- **IGNORE** any result containing error messages.
-- **IGNORE** any result that is `null`.
+The batch call returns once all extractions complete. Collect all successful results.
+**CRITICAL:** Some agents may fail.
+- **IGNORE** any result with a non-null `error` or a null `price`.
 - **DO NOT** stop or complain if some agents fail. As long as you have at least 1 valid result, proceed.
 
 ### 6. Select Top 5
@@ -155,21 +134,37 @@ If none of product is available: Include "error": "No available products found"
 
 **FINAL RULES:**
 - Step 1: Use `search_engine` tool for SERP search
-- Steps 2-3: Do filtering and prioritizing logic yourself
-- Step 4: Call `price_extractor_agent` tool MULTIPLE TIMES (one URL per call, all in parallel)
-- NEVER send multiple URLs to price_extractor_agent in one call
-- Always sort URLs deterministically before delegating
+- Steps 2-3: Call `filter_and_rank_urls` ONCE with all SERP URLs
+- Step 4: Call `extract_prices_parallel` ONCE with all selected URLs and tiers
+- The ranked order from `filter_and_rank_urls` is already deterministic - keep it
 - Handle selection and ranking after collecting all results
-- Return ONLY valid JSON, no extra text""",
-    )
+- Return ONLY valid JSON, no extra text"""
 
 
-# Create shopping agent using imported price_extractor_agent
-shopping_agent = _create_shopping_agent(price_extractor_agent)
+def _create_shopping_agent() -> Agent:
+    """Uses BrightData SERP search and web crawler to find and verify product prices."""
+    return Agent(
+        name="shopping_agent",
+        model=get_gemini("gemini-2.5-flash-lite"),
+        tools=[get_brightdata_toolset(), filter_and_rank_urls, extract_prices_parallel],
+        before_tool_callback=throttle_brightdata,
+        generate_content_config=GenerateContentConfig(
+            temperature=0.1,
+            # Output is a <=5-entry JSON result; the bound stops pathological
+            # generations from running up latency and cost.
+            max_output_tokens=2048,
+            response_mime_type="application/json",
+            response_json_schema=ShoppingResult.model_json_schema(),
+        ),
+        instruction=_SHOPPING_INSTRUCTION,
+    )
 
 
-# Main app uses shopping agent which delegates scraping+extraction to multiple parallel extractor calls
-app = App(
-    root_agent=shopping_agent,
-    name="shopping",
+# Lazy-loaded shopping agent and app instances (PEP 562). The app uses the
+# shopping agent which delegates scraping+extraction to the batched
+# extractor tool.
+get_shopping_agent, get_app, __getattr__ = lazy_agent_exports(
+    "shopping_agent",
+    _create_shopping_agent,
+    lambda agent: App(root_agent=agent, name="shopping"),
 )
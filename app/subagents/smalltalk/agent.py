@@ -1,21 +1,13 @@
 from google.adk.agents import Agent
 from google.adk.apps.app import App
-from google.adk.models.google_llm import Gemini
 from google.adk.tools.google_search_tool import google_search
 from google.genai.types import GenerateContentConfig
 
-from app.subagents.config import default_retry_config
+from app.subagents.config import get_gemini
+from app.subagents.lazy import lazy_agent_exports
 
-
-def _create_smalltalk_agent() -> Agent:
-    return Agent(
-        name="smalltalk_agent",
-        model=Gemini(model="gemini-2.5-flash-lite", retry_options=default_retry_config),
-        tools=[google_search],
-        generate_content_config=GenerateContentConfig(
-            temperature=0.8,
-        ),
-        instruction="""You are a witty, funny, and helpful assistant for general conversations and research queries.
+# Built once at import; static across all constructions.
+_SMALLTALK_INSTRUCTION = """You are a witty, funny, and helpful assistant for general conversations and research queries.
 
 ## YOUR PERSONALITY
 - Be funny, witty, and charming in your responses
@@ -51,14 +43,24 @@ You: "Quantum physics is like magic, except the universe actually follows these
 User: "Best restaurants in Helsinki?"
 You: "I'd love to help, but restaurant recommendations are more up my shopping agent colleagues' alley! For Helsinki dining, you might want to check with the shopping assistant. I can tell you about Finnish food culture though - have you tried reindeer? It's like beef but with more Nordic charm! 🦌"
 
-Remember: Be helpful, be witty, but know when to pass the torch to the right specialist!""",
-    )
+Remember: Be helpful, be witty, but know when to pass the torch to the right specialist!"""
 
 
-# Global smalltalk agent instance
-smalltalk_agent = _create_smalltalk_agent()
+def _create_smalltalk_agent() -> Agent:
+    return Agent(
+        name="smalltalk_agent",
+        model=get_gemini("gemini-2.5-flash-lite"),
+        tools=[google_search],
+        generate_content_config=GenerateContentConfig(
+            temperature=0.8,
+        ),
+        instruction=_SMALLTALK_INSTRUCTION,
+    )
+
 
-app = App(
-    root_agent=smalltalk_agent,
-    name="smalltalk",
+# Lazy-loaded smalltalk agent and app instances (PEP 562)
+get_smalltalk_agent, get_app, __getattr__ = lazy_agent_exports(
+    "smalltalk_agent",
+    _create_smalltalk_agent,
+    lambda agent: App(root_agent=agent, name="smalltalk"),
 )
@@ -0,0 +1,80 @@
+"""Batched price lookup tool.
+
+The orchestrator previously asked the LLM to call `shopping_agent` once
+per selected model, which serializes N independent network-bound lookups
+behind N model decode turns. This tool fans the per-product calls out with
+`asyncio.gather`, so the LLM makes a single tool call and the lookups
+overlap in time.
+"""
+
+import asyncio
+from typing import Any
+
+from google.adk.tools import AgentTool, ToolContext
+
+from app.subagents.shopping.agent import get_shopping_agent
+from app.tools.shopping_result_cache import (
+    shopping_result_cache_lookup,
+    shopping_result_cache_store,
+)
+
+# Cap concurrent lookups across all batches: each lookup fans out into
+# several scrapes downstream, and beyond this extra concurrency just queues
+# at the scraping backend. asyncio primitives bind their loop lazily, so
+# module scope is safe (Python >= 3.10).
+_MAX_CONCURRENT_LOOKUPS = 16
+_lookup_semaphore = asyncio.Semaphore(_MAX_CONCURRENT_LOOKUPS)
+
+# Memoized wrapper: rebuilding an AgentTool per call re-captures the
+# agent's schema every time.
+_shopping_tool: AgentTool | None = None
+
+
+def _get_shopping_tool() -> AgentTool:
+    global _shopping_tool
+    if _shopping_tool is None:
+        _shopping_tool = AgentTool(get_shopping_agent())
+    return _shopping_tool
+
+
+async def find_prices_batch(
+    products: list[str], country: str, tool_context: ToolContext
+) -> list[Any]:
+    """Find prices for several products in one call.
+
+    Runs one shopping lookup per product concurrently and returns the
+    results in the same order as the input list. Failed lookups are
+    reported inline as error entries instead of failing the whole batch.
+
+    Args:
+        products: Product model names to look up
+        country: Country name the user is shopping in
+        tool_context: ADK tool context (injected by the framework)
+
+    Returns:
+        One shopping result (or error entry) per requested product
+    """
+    shopping_tool = _get_shopping_tool()
+
+    async def _one(product: str) -> Any:
+        args = {"request": f"{product} price in {country}"}
+        # Direct run_async bypasses the root agent's tool callbacks, so
+        # consult the shopping-result cache explicitly here.
+        cached = shopping_result_cache_lookup(shopping_tool, args, tool_context)
+        if cached is not None:
+            return cached
+        async with _lookup_semaphore:
+            result = await shopping_tool.run_async(args=args, tool_context=tool_context)
+        shopping_result_cache_store(shopping_tool, args, tool_context, result)
+        return result
+
+    results = await asyncio.gather(
+        *(_one(product) for product in products), return_exceptions=True
+    )
+
+    return [
+        {"product": product, "error": str(result)}
+        if isinstance(result, BaseException)
+        else result
+        for product, result in zip(products, results, strict=True)
+    ]
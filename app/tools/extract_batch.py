@@ -0,0 +1,153 @@
+"""Batched price extraction tool.
+
+The shopping agent previously asked the LLM to call `price_extractor_agent`
+once per URL "in parallel", which leaves the fan-out to the model's
+willingness to emit N tool calls in one turn and serializes re-entry
+through a decode step. This tool takes the whole URL list, runs the
+extractions concurrently in Python, and returns one result per URL — a
+single tool call regardless of N.
+
+Scraper tail latency is severe, so the batch does not wait for stragglers
+unconditionally: once enough successful extractions are in and a soft
+deadline has passed, the remaining tasks are cancelled, and a hard
+deadline bounds the whole batch either way. The ranker only needs the
+top 5 results, so the slowest scrapes rarely change the outcome.
+"""
+
+import asyncio
+import json
+import time
+from typing import Any
+
+from google.adk.tools import AgentTool, ToolContext
+
+from app.subagents.price_extractor.agent import get_price_extractor_agent
+from app.tools.price_result_cache import (
+    price_result_cache_lookup,
+    price_result_cache_store,
+)
+
+# Cap concurrent extractions; each one is a scrape plus a model call, and
+# beyond this extra concurrency just queues downstream.
+_MAX_CONCURRENT_EXTRACTIONS = 8
+_extract_semaphore = asyncio.Semaphore(_MAX_CONCURRENT_EXTRACTIONS)
+
+# Early-exit policy: with this many successes in hand after the soft
+# deadline, stragglers are cancelled. The hard deadline bounds the batch
+# even when too few extractions succeed.
+_EARLY_EXIT_RESULTS = 5
+_SOFT_DEADLINE_SECONDS = 3.0
+_HARD_DEADLINE_SECONDS = 30.0
+
+# Memoized wrapper: rebuilding an AgentTool per call re-captures the
+# agent's schema every time.
+_extractor_tool: AgentTool | None = None
+
+
+def _get_extractor_tool() -> AgentTool:
+    global _extractor_tool
+    if _extractor_tool is None:
+        _extractor_tool = AgentTool(get_price_extractor_agent())
+    return _extractor_tool
+
+
+def _is_successful(result: Any) -> bool:
+    """True when an extraction result carries usable price data."""
+    if not result:
+        return False
+    if isinstance(result, dict):
+        return not result.get("error")
+    if isinstance(result, str):
+        stripped = result.strip()
+        if stripped in ("", "null") or stripped.startswith("FAILED"):
+            return False
+        if stripped.startswith("{"):
+            try:
+                parsed = json.loads(stripped)
+            except json.JSONDecodeError:
+                return True
+            return isinstance(parsed, dict) and not parsed.get("error")
+    return True
+
+
+async def extract_prices_parallel(
+    urls: list[str], tiers: list[int], product_name: str, tool_context: ToolContext
+) -> list[Any]:
+    """Extract price data from several URLs in one call.
+
+    Runs one extraction per URL concurrently and returns the results in
+    the same order as the input list. Failed extractions are reported
+    inline as error entries instead of failing the whole batch; stragglers
+    cancelled by the early-exit/deadline policy appear as error entries
+    too.
+
+    Args:
+        urls: Product page URLs to extract from
+        tiers: Priority tier (1, 2, or 3) for each URL, same order as urls
+        product_name: Product name used for page verification
+        tool_context: ADK tool context (injected by the framework)
+
+    Returns:
+        One extraction result (or error entry) per requested URL
+    """
+    # The model composes both lists; a silent zip truncation on a length
+    # mismatch would drop URLs from the result arity, so report it inline.
+    if len(urls) != len(tiers):
+        mismatch = f"urls/tiers length mismatch: {len(urls)} != {len(tiers)}"
+        return [{"url": url, "error": mismatch} for url in urls]
+
+    extractor_tool = _get_extractor_tool()
+
+    async def _one(url: str, tier: int) -> Any:
+        args = {"url": url, "tier": tier, "product_name": product_name}
+        # Direct run_async bypasses agent-level tool callbacks, so consult
+        # the price-result cache explicitly here.
+        cached = price_result_cache_lookup(extractor_tool, args, tool_context)
+        if cached is not None:
+            return cached
+        async with _extract_semaphore:
+            result = await extractor_tool.run_async(
+                args=args, tool_context=tool_context
+            )
+        price_result_cache_store(extractor_tool, args, tool_context, result)
+        return result
+
+    start = time.monotonic()
+    tasks = [
+        asyncio.ensure_future(_one(url, tier))
+        for url, tier in zip(urls, tiers, strict=True)
+    ]
+    pending: set[asyncio.Task] = set(tasks)
+    successes = 0
+    while pending:
+        remaining = _HARD_DEADLINE_SECONDS - (time.monotonic() - start)
+        if remaining <= 0:
+            break
+        done, pending = await asyncio.wait(
+            pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED
+        )
+        successes += sum(
+            1
+            for task in done
+            if task.exception() is None and _is_successful(task.result())
+        )
+        if (
+            pending
+            and successes >= _EARLY_EXIT_RESULTS
+            and time.monotonic() - start >= _SOFT_DEADLINE_SECONDS
+        ):
+            break
+    for task in pending:
+        task.cancel()
+
+    results: list[Any] = []
+    for url, task in zip(urls, tasks, strict=True):
+        if task in pending or task.cancelled():
+            results.append(
+                {"url": url, "error": "cancelled by batch early-exit/deadline"}
+            )
+        elif task.exception() is not None:
+            results.append({"url": url, "error": str(task.exception())})
+        else:
+            results.append(task.result())
+    return results
@@ -0,0 +1,97 @@
+"""Deterministic research-to-prices pipeline.
+
+When a user asks for recommendations and prices in one message, the
+LLM-driven flow costs several decode turns: research call, parse, then a
+pricing call. The control flow between those steps is entirely regular,
+so this module runs it in Python — research the category, parse the
+recommended models, fan out the price lookups — and exposes the whole
+thing as a single tool call for the root agent.
+"""
+
+import json
+import re
+from typing import Any
+
+from google.adk.tools import AgentTool, ToolContext
+
+from app.subagents.research.agent import get_research_agent
+from app.tools.batch import find_prices_batch
+from app.tools.research_cache import research_cache_lookup, research_cache_store
+
+# Research output is JSON, possibly wrapped in prose or a code fence.
+_JSON_ARRAY_RE = re.compile(r"\[.*\]", re.S)
+
+# Memoized wrapper, mirroring find_prices_batch's shopping tool.
+_research_tool: AgentTool | None = None
+
+
+def _get_research_tool() -> AgentTool:
+    global _research_tool
+    if _research_tool is None:
+        _research_tool = AgentTool(get_research_agent())
+    return _research_tool
+
+
+def _parse_recommendations(research_output: Any) -> list[dict[str, str]]:
+    """Parse the research agent's JSON output into recommendation dicts.
+
+    Tolerates prose or code fences around the JSON array; returns an
+    empty list when nothing parseable is found.
+    """
+    if isinstance(research_output, list):
+        return [item for item in research_output if isinstance(item, dict)]
+    if not isinstance(research_output, str):
+        return []
+    match = _JSON_ARRAY_RE.search(research_output)
+    if match is None:
+        return []
+    try:
+        parsed = json.loads(match.group(0))
+    except json.JSONDecodeError:
+        return []
+    return (
+        [item for item in parsed if isinstance(item, dict)]
+        if isinstance(parsed, list)
+        else []
+    )
+
+
+async def research_with_prices(
+    query: str, country: str, tool_context: ToolContext
+) -> dict[str, Any]:
+    """Research a product category and price all recommendations in one call.
+
+    Runs the research agent, parses its recommended models, then prices
+    every model concurrently via find_prices_batch — one tool call for the
+    root agent instead of a research turn plus a pricing turn.
+
+    Args:
+        query: Product category or request, e.g. "best wireless headphones"
+        country: Country name the user is shopping in
+        tool_context: ADK tool context (injected by the framework)
+
+    Returns:
+        Dict with "recommendations" (model/reason entries) and "prices"
+        (one shopping result per recommended model)
+    """
+    research_tool = _get_research_tool()
+    research_args = {"request": f"Research {query} for {country}"}
+    # Direct run_async bypasses the root agent's tool callbacks, so consult
+    # the research cache explicitly here.
+    research_output = research_cache_lookup(research_tool, research_args, tool_context)
+    if research_output is None:
+        research_output = await research_tool.run_async(
+            args=research_args,
+            tool_context=tool_context,
+        )
+        research_cache_store(
+            research_tool, research_args, tool_context, research_output
+        )
+
+    recommendations = _parse_recommendations(research_output)
+    models = [item["model"] for item in recommendations if item.get("model")]
+    if not models:
+        return {"recommendations": [], "prices": [], "error": "No recommendations"}
+
+    prices = await find_prices_batch(models, country, tool_context)
+    return {"recommendations": recommendations, "prices": prices}
@@ -0,0 +1,100 @@
+"""Compiled price/availability pre-extraction for scraped pages.
+
+The extractor model otherwise hunts for prices inside raw page markdown.
+These module-level compiled patterns pull candidate prices and
+availability phrases out at C speed so they can be attached to the page
+as structured hints — shifting the cheap part of extraction from the LLM
+to regex while keeping the model responsible for verification.
+"""
+
+import re
+from urllib.parse import urlparse
+
+# Marker prefixed to annotated pages. ADK runs after_tool_callback even on
+# cache-hit short-circuits, so annotation must be idempotent or served
+# hits would re-annotate (and re-store) already-annotated text.
+_HINTS_MARKER = "[pre-extracted hints]"
+
+# Currency-adjacent numbers: "€129,90", "$ 99.99", "129.90 EUR", "USD 50".
+_PRICE_RE = re.compile(
+    r"(?<![A-Za-z])(?:€|\$|£|USD|EUR|GBP)\s?\d[\d.,]*"
+    r"|\d[\d.,]*\s?(?:EUR|USD|GBP|SEK|NOK|DKK)\b"
+)
+
+# Known price-comparison domains (mirrors the extractor prompt's list).
+_AGGREGATOR_DOMAINS = frozenset(
+    {
+        "hinta.fi",
+        "hintaopas.fi",
+        "hintaseuranta.fi",
+        "vertaa.fi",
+        "idealo.de",
+        "pricerunner.com",
+        "geizhals.de",
+        "prisjakt.nu",
+    }
+)
+
+# Availability phrases across the storefront languages the agents target.
+_STOCK_RE = re.compile(
+    r"\b(?:in stock|out of stock|sold out|available"
+    r"|varastossa|ei varastossa|på lager|verfügbar|ausverkauft)\b",
+    re.IGNORECASE,
+)
+
+
+def extract_prices(text: str, limit: int = 5) -> list[str]:
+    """Return up to `limit` price-like strings found in the text."""
+    return _PRICE_RE.findall(text)[:limit]
+
+
+def extract_availability(text: str) -> str | None:
+    """Return the first availability phrase found in the text, if any."""
+    match = _STOCK_RE.search(text)
+    return match.group(0) if match else None
+
+
+def is_aggregator(url: str) -> bool:
+    """True when the URL's host is a known price-comparison site."""
+    host = (urlparse(url).hostname or "").removeprefix("www.")
+    return host in _AGGREGATOR_DOMAINS
+
+
+def derive_store_name(url: str) -> str | None:
+    """Derive a display store name from a URL's host in Python.
+
+    "https://www.verkkokauppa.com/fi/product/123" -> "Verkkokauppa.com".
+    The model otherwise spends output tokens reformatting the domain and
+    frequently mis-capitalizes it.
+    """
+    host = (urlparse(url).hostname or "").removeprefix("www.")
+    if not host:
+        return None
+    return host[0].upper() + host[1:]
+
+
+def annotate_prices(
+    text: str, store: str | None = None, aggregator: bool = False
+) -> str:
+    """Prepend pre-extracted price/availability/store hints to scraped markdown.
+
+    Returns the text unchanged when no hint is available, or when it is
+    already annotated (the post-processor re-runs on cache hits).
+    """
+    if text.startswith(_HINTS_MARKER):
+        return text
+    prices = extract_prices(text)
+    availability = extract_availability(text)
+    if not prices and not availability and not store and not aggregator:
+        return text
+
+    hints = []
+    if prices:
+        hints.append("prices: " + ", ".join(prices))
+    if availability:
+        hints.append(f"availability: {availability}")
+    if store:
+        hints.append(f"store (from URL domain): {store}")
+    if aggregator:
+        hints.append("page type: aggregator (known price-comparison domain)")
+    return f"{_HINTS_MARKER} {'; '.join(hints)}\n\n{text}"
@@ -0,0 +1,97 @@
+"""TTL cache for extracted price results.
+
+The scrape cache collapses repeat page fetches, but a repeated lookup for
+a popular SKU still pays the extractor model's decode on every call. This
+module caches the price extractor's final output keyed by canonical URL
+plus product name and serves hits through a ``before_tool_callback`` on
+the shopping agent, skipping both the scrape and the LLM turn. The TTL is
+short enough that prices stay current for practical purposes.
+"""
+
+import json
+import time
+from typing import Any
+
+from app.tools.scrape_cache import _canonicalize
+
+# Extracted results expire after this many seconds.
+_CACHE_TTL_SECONDS = 900.0
+
+# Bound memory: oldest entries are evicted once the cache exceeds this size.
+_MAX_ENTRIES = 1024
+
+# Tool names whose responses are cacheable extraction results.
+_CACHEABLE_TOOLS = frozenset({"price_extractor_agent"})
+
+# (canonical url, product name) -> (expiry timestamp, tool response)
+_cache: dict[tuple[str, str], tuple[float, Any]] = {}
+
+
+def _cache_key(tool: Any, args: dict[str, Any]) -> tuple[str, str] | None:
+    """Build a cache key for an extractor call, or None when not cacheable."""
+    if tool.name not in _CACHEABLE_TOOLS:
+        return None
+    url = args.get("url")
+    product_name = args.get("product_name")
+    if not isinstance(url, str) or not url or not isinstance(product_name, str):
+        return None
+    return _canonicalize(url), product_name.strip().lower()
+
+
+def price_result_cache_lookup(
+    tool: Any, args: dict[str, Any], tool_context: Any
+) -> Any | None:
+    """`before_tool_callback`: return a cached extraction on hit, else None."""
+    key = _cache_key(tool, args)
+    if key is None:
+        return None
+    entry = _cache.get(key)
+    if entry is None:
+        return None
+    expires_at, response = entry
+    if time.monotonic() > expires_at:
+        _cache.pop(key, None)
+        return None
+    return response
+
+
+def price_result_cache_store(
+    tool: Any, args: dict[str, Any], tool_context: Any, tool_response: Any
+) -> Any | None:
+    """`after_tool_callback`: store successful extraction responses.
+
+    Failed extractions (empty, null, FAILED markers, or a schema result
+    with a non-null "error") are not cached so a transient scrape error
+    doesn't poison the window.
+    """
+    key = _cache_key(tool, args)
+    if key is None or not tool_response:
+        return None
+    if isinstance(tool_response, dict) and tool_response.get("error"):
+        return None
+    if isinstance(tool_response, str):
+        stripped = tool_response.strip()
+        if stripped in ("", "null") or stripped.startswith("FAILED"):
+            return None
+        if stripped.startswith("{"):
+            try:
+                parsed = json.loads(stripped)
+            except json.JSONDecodeError:
+                pass
+            else:
+                if isinstance(parsed, dict) and parsed.get("error"):
+                    return None
+    entry = _cache.get(key)
+    if entry is not None and entry[1] is tool_response:
+        # Served from the cache (after_tool_callback also runs on
+        # short-circuited calls); re-storing would refresh the TTL.
+        return None
+    if len(_cache) >= _MAX_ENTRIES:
+        _cache.pop(next(iter(_cache)))
+    _cache[key] = (time.monotonic() + _CACHE_TTL_SECONDS, tool_response)
+    return None
+
+
+def clear_cache() -> None:
+    """Drop all cached extractions (used by tests)."""
+    _cache.clear()
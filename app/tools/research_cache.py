@@ -0,0 +1,82 @@
+"""TTL cache for research agent recommendations.
+
+Research queries arrive in a near-canonical shape ("Research <category>
+for <country>") because the orchestrator composes them, so plain
+normalized-text matching already collapses most repeat traffic without an
+embedding model in the loop. Hits skip the research agent's search and
+decode turns entirely. Recommendations age slowly, so the TTL is longer
+than the price caches'.
+"""
+
+import re
+import time
+from typing import Any
+
+# Cached recommendations expire after this many seconds.
+_CACHE_TTL_SECONDS = 1800.0
+
+# Bound memory: oldest entries are evicted once the cache exceeds this size.
+_MAX_ENTRIES = 256
+
+# Tool names whose responses are cacheable research results.
+_CACHEABLE_TOOLS = frozenset({"research_agent"})
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+# normalized request -> (expiry timestamp, tool response)
+_cache: dict[str, tuple[float, Any]] = {}
+
+
+def _normalize(request: str) -> str:
+    """Collapse case and whitespace so cosmetic variants share a key."""
+    return _WHITESPACE_RE.sub(" ", request.strip().lower())
+
+
+def _cache_key(tool: Any, args: dict[str, Any]) -> str | None:
+    """Build a cache key for a research call, or None when not cacheable."""
+    if tool.name not in _CACHEABLE_TOOLS:
+        return None
+    request = args.get("request")
+    if not isinstance(request, str) or not request:
+        return None
+    return _normalize(request)
+
+
+def research_cache_lookup(
+    tool: Any, args: dict[str, Any], tool_context: Any
+) -> Any | None:
+    """`before_tool_callback`: return cached recommendations on hit."""
+    key = _cache_key(tool, args)
+    if key is None:
+        return None
+    entry = _cache.get(key)
+    if entry is None:
+        return None
+    expires_at, response = entry
+    if time.monotonic() > expires_at:
+        _cache.pop(key, None)
+        return None
+    return response
+
+
+def research_cache_store(
+    tool: Any, args: dict[str, Any], tool_context: Any, tool_response: Any
+) -> Any | None:
+    """`after_tool_callback`: store non-empty research responses."""
+    key = _cache_key(tool, args)
+    if key is None or not tool_response:
+        return None
+    entry = _cache.get(key)
+    if entry is not None and entry[1] is tool_response:
+        # Served from the cache (after_tool_callback also runs on
+        # short-circuited calls); re-storing would refresh the TTL.
+        return None
+    if len(_cache) >= _MAX_ENTRIES:
+        _cache.pop(next(iter(_cache)))
+    _cache[key] = (time.monotonic() + _CACHE_TTL_SECONDS, tool_response)
+    return None
+
+
+def clear_cache() -> None:
+    """Drop all cached research results (used by tests)."""
+    _cache.clear()
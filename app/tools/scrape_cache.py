@@ -0,0 +1,134 @@
+"""TTL cache for scraped page content.
+
+Price extraction fetches the same aggregator pages (Hinta.fi, Idealo, ...)
+repeatedly when several products or users converge on popular SKUs within
+a short window. This module caches `scrape_as_markdown` responses keyed by
+a canonicalized URL and serves hits through a ``before_tool_callback``,
+skipping the BrightData round trip entirely. A short TTL keeps prices
+reasonably fresh while still collapsing the burst traffic, and fewer
+origin fetches also lowers the chance of rate limiting or captchas.
+
+Concurrent duplicates are also collapsed: when parallel extractor calls
+hit the same canonical URL, the first registers an in-flight future and
+the rest await it instead of issuing their own fetch.
+"""
+
+import asyncio
+import time
+from typing import Any
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# Scraped pages expire after this many seconds.
+_CACHE_TTL_SECONDS = 600.0
+
+# Bound memory: oldest entries are evicted once the cache exceeds this size.
+_MAX_ENTRIES = 1024
+
+# Tool names whose responses are cacheable page fetches.
+_CACHEABLE_TOOLS = frozenset({"scrape_as_markdown"})
+
+# Tracking query parameters that don't affect page content.
+_TRACKING_PARAMS = ("utm_", "gclid", "fbclid", "msclkid")
+
+# Waiters give up on an in-flight fetch after this long; a fetch whose
+# tool call errored never resolves its future, so this bounds the wait.
+_INFLIGHT_TIMEOUT_SECONDS = 120.0
+
+# canonical url -> (expiry timestamp, tool response)
+_cache: dict[str, tuple[float, Any]] = {}
+
+# canonical url -> (start timestamp, future resolved by the first fetcher)
+_inflight: dict[str, tuple[float, asyncio.Future]] = {}
+
+
+def _canonicalize(url: str) -> str:
+    """Normalize a URL so tracking noise doesn't fragment the cache.
+
+    Drops the fragment and known tracking query parameters, and sorts the
+    remaining query string for a stable key.
+    """
+    scheme, netloc, path, query, _fragment = urlsplit(url)
+    params = [
+        (key, value)
+        for key, value in parse_qsl(query, keep_blank_values=True)
+        if not key.lower().startswith(_TRACKING_PARAMS[0])
+        and key.lower() not in _TRACKING_PARAMS[1:]
+    ]
+    params.sort()
+    return urlunsplit((scheme.lower(), netloc.lower(), path, urlencode(params), ""))
+
+
+def _cache_key(tool: Any, args: dict[str, Any]) -> str | None:
+    """Build a cache key for a tool call, or None when not cacheable."""
+    if tool.name not in _CACHEABLE_TOOLS:
+        return None
+    url = args.get("url")
+    if not isinstance(url, str) or not url:
+        return None
+    return _canonicalize(url)
+
+
+async def scrape_cache_lookup(
+    tool: Any, args: dict[str, Any], tool_context: Any
+) -> Any | None:
+    """`before_tool_callback`: return a cached scrape on hit, else None.
+
+    On a miss with the same URL already being fetched, awaits the
+    in-flight future so concurrent duplicates share one fetch. Otherwise
+    registers a future for this call and lets the fetch proceed.
+    """
+    key = _cache_key(tool, args)
+    if key is None:
+        return None
+    entry = _cache.get(key)
+    if entry is not None:
+        expires_at, response = entry
+        if time.monotonic() <= expires_at:
+            return response
+        _cache.pop(key, None)
+
+    inflight = _inflight.get(key)
+    if inflight is not None:
+        started_at, future = inflight
+        remaining = _INFLIGHT_TIMEOUT_SECONDS - (time.monotonic() - started_at)
+        if remaining > 0:
+            try:
+                return await asyncio.wait_for(asyncio.shield(future), remaining)
+            except Exception:
+                return None
+        _inflight.pop(key, None)
+
+    _inflight[key] = (time.monotonic(), asyncio.get_running_loop().create_future())
+    return None
+
+
+def scrape_cache_store(
+    tool: Any, args: dict[str, Any], tool_context: Any, tool_response: Any
+) -> Any | None:
+    """`after_tool_callback`: store successful scrape responses."""
+    key = _cache_key(tool, args)
+    if key is None:
+        return None
+    inflight = _inflight.pop(key, None)
+    if inflight is not None:
+        _started_at, future = inflight
+        if not future.done():
+            future.set_result(tool_response)
+    if not tool_response:
+        return None
+    entry = _cache.get(key)
+    if entry is not None and entry[1] is tool_response:
+        # This response was served from the cache (after_tool_callback also
+        # runs on short-circuited calls); re-storing it would refresh the
+        # TTL and a popular page would never expire.
+        return None
+    if len(_cache) >= _MAX_ENTRIES:
+        _cache.pop(next(iter(_cache)))
+    _cache[key] = (time.monotonic() + _CACHE_TTL_SECONDS, tool_response)
+    return None
+
+
+def clear_cache() -> None:
+    """Drop all cached scrapes and in-flight markers (used by tests)."""
+    _cache.clear()
+    _inflight.clear()
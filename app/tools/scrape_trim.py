@@ -0,0 +1,110 @@
+"""Trimming of scraped page content before it reaches the model.
+
+Aggregator pages can run to hundreds of KB of markdown; feeding the whole
+blob to the extractor model inflates prefill tokens and time-to-first-token
+for no gain — the price data sits in a small region of the page. This
+module bounds the scraped markdown to a window anchored on the first price
+pattern, falling back to the document head when no price is found.
+"""
+
+import re
+from collections.abc import Callable
+from typing import Any
+
+# Maximum characters of scraped markdown forwarded to the model.
+_MAX_SCRAPE_CHARS = 32_000
+
+# Characters kept before the first price hit so surrounding table context
+# (store names, availability columns) survives the trim.
+_CONTEXT_BEFORE = 2_000
+
+# First occurrence of a currency-adjacent number marks the pricing region.
+_PRICE_HINT_RE = re.compile(r"[€$£]\s?\d|\d[\d.,]*\s?(?:EUR|USD|GBP|SEK|NOK|DKK)\b")
+
+# Availability keywords (multi-language, matching the extractor prompt).
+_STOCK_HINT_RE = re.compile(
+    r"in stock|out of stock|sold out|available|varastossa|på lager"
+    r"|verfügbar|ausverkauft|limited",
+    re.IGNORECASE,
+)
+
+# Lines within this many lines of a price or stock hit survive the
+# relevance filter, so table context (store columns) comes along.
+_CONTEXT_LINES = 5
+
+# Leading lines always kept: page title and store identity live at the top,
+# and product verification needs them.
+_HEAD_LINES = 10
+
+# A filtered page shorter than this is suspicious (hints missed the real
+# pricing markup); fall back to the plain window slice instead.
+_MIN_FILTERED_CHARS = 500
+
+
+def _filter_relevant_lines(text: str) -> str:
+    """Keep only lines near price or availability hits, plus the page head.
+
+    Most of an oversized page is navigation, reviews, and boilerplate the
+    extractor never uses; the price data clusters around a few lines.
+    """
+    lines = text.splitlines()
+    keep = [False] * len(lines)
+    keep[:_HEAD_LINES] = [True] * min(_HEAD_LINES, len(lines))
+    for i, line in enumerate(lines):
+        if _PRICE_HINT_RE.search(line) or _STOCK_HINT_RE.search(line):
+            start = max(0, i - _CONTEXT_LINES)
+            end = min(len(lines), i + _CONTEXT_LINES + 1)
+            keep[start:end] = [True] * (end - start)
+    return "\n".join(line for i, line in enumerate(lines) if keep[i])
+
+
+def trim_scraped_markdown(text: str) -> str:
+    """Bound scraped markdown to the pricing-relevant content.
+
+    Args:
+        text: Full scraped page markdown
+
+    Returns:
+        The text unchanged when already within budget. Oversized pages are
+        first reduced to price/availability lines (with context) via
+        _filter_relevant_lines; when that filter strips too much, or the
+        result still exceeds budget, a _MAX_SCRAPE_CHARS slice anchored
+        just before the first price pattern is used instead.
+    """
+    if len(text) <= _MAX_SCRAPE_CHARS:
+        return text
+
+    filtered = _filter_relevant_lines(text)
+    if _MIN_FILTERED_CHARS <= len(filtered) <= _MAX_SCRAPE_CHARS:
+        return filtered
+    if len(filtered) > _MAX_SCRAPE_CHARS:
+        text = filtered
+
+    match = _PRICE_HINT_RE.search(text)
+    start = max(0, match.start() - _CONTEXT_BEFORE) if match else 0
+    return text[start : start + _MAX_SCRAPE_CHARS]
+
+
+def map_scrape_text(tool_response: Any, transform: Callable[[str], str]) -> Any | None:
+    """Apply a text transform to the payload of a scrape tool response.
+
+    Handles the response shapes the MCP toolset produces (plain string or
+    a dict with a string "result"). Returns the transformed response, or
+    None when the response carries no text or the transform left it
+    unchanged.
+    """
+    if isinstance(tool_response, str):
+        transformed = transform(tool_response)
+        return transformed if transformed != tool_response else None
+    if isinstance(tool_response, dict):
+        result = tool_response.get("result")
+        if isinstance(result, str):
+            transformed = transform(result)
+            if transformed != result:
+                return {**tool_response, "result": transformed}
+    return None
+
+
+def trim_scrape_response(tool_response: Any) -> Any | None:
+    """Trim the text payload of a scrape tool response (see map_scrape_text)."""
+    return map_scrape_text(tool_response, trim_scraped_markdown)
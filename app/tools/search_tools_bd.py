@@ -5,6 +5,8 @@ This module provides integration with BrightData's Streamable HTTP MCP server
 for enterprise-grade SERP and web crawling capabilities.
 """
 
+from typing import Any
+
 from google.adk.tools.mcp_tool.mcp_session_manager import StreamableHTTPConnectionParams
 from google.adk.tools.mcp_tool.mcp_toolset import McpToolset
 
@@ -35,5 +37,21 @@ def _create_brightdata_toolset() -> McpToolset:
     )
 
 
-# Global BrightData toolset instance for use by agents
-brightdata_toolset = _create_brightdata_toolset()
+# Lazy-loaded BrightData toolset instance for use by agents
+_brightdata_toolset: McpToolset | None = None
+
+
+def get_brightdata_toolset() -> McpToolset:
+    """Get the lazy-loaded BrightData toolset instance."""
+    global _brightdata_toolset
+    if _brightdata_toolset is None:
+        _brightdata_toolset = _create_brightdata_toolset()
+    return _brightdata_toolset
+
+
+def __getattr__(name: str) -> Any:
+    """Lazily expose `brightdata_toolset` so importing this module does not
+    force settings loading; the toolset is built on first access (PEP 562)."""
+    if name == "brightdata_toolset":
+        return get_brightdata_toolset()
+    raise AttributeError(name)
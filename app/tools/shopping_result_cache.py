@@ -0,0 +1,82 @@
+"""TTL cache for complete shopping lookups.
+
+A shopping lookup is the most expensive unit in the tree — a SERP search
+plus several scrapes and extractions — and the same "<product> price in
+<country>" request repeats across users polling popular SKUs. Requests
+arrive in a near-canonical shape because the orchestrator composes them,
+so normalized-text matching collapses the repeats. The TTL matches the
+price-result cache: short enough that prices stay current.
+"""
+
+import re
+import time
+from typing import Any
+
+# Cached lookups expire after this many seconds.
+_CACHE_TTL_SECONDS = 900.0
+
+# Bound memory: oldest entries are evicted once the cache exceeds this size.
+_MAX_ENTRIES = 512
+
+# Tool names whose responses are cacheable shopping results.
+_CACHEABLE_TOOLS = frozenset({"shopping_agent"})
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+# normalized request -> (expiry timestamp, tool response)
+_cache: dict[str, tuple[float, Any]] = {}
+
+
+def _normalize(request: str) -> str:
+    """Collapse case and whitespace so cosmetic variants share a key."""
+    return _WHITESPACE_RE.sub(" ", request.strip().lower())
+
+
+def _cache_key(tool: Any, args: dict[str, Any]) -> str | None:
+    """Build a cache key for a shopping call, or None when not cacheable."""
+    if tool.name not in _CACHEABLE_TOOLS:
+        return None
+    request = args.get("request")
+    if not isinstance(request, str) or not request:
+        return None
+    return _normalize(request)
+
+
+def shopping_result_cache_lookup(
+    tool: Any, args: dict[str, Any], tool_context: Any
+) -> Any | None:
+    """`before_tool_callback`: return cached shopping results on hit."""
+    key = _cache_key(tool, args)
+    if key is None:
+        return None
+    entry = _cache.get(key)
+    if entry is None:
+        return None
+    expires_at, response = entry
+    if time.monotonic() > expires_at:
+        _cache.pop(key, None)
+        return None
+    return response
+
+
+def shopping_result_cache_store(
+    tool: Any, args: dict[str, Any], tool_context: Any, tool_response: Any
+) -> Any | None:
+    """`after_tool_callback`: store non-empty shopping responses."""
+    key = _cache_key(tool, args)
+    if key is None or not tool_response:
+        return None
+    entry = _cache.get(key)
+    if entry is not None and entry[1] is tool_response:
+        # Served from the cache (after_tool_callback also runs on
+        # short-circuited calls); re-storing would refresh the TTL.
+        return None
+    if len(_cache) >= _MAX_ENTRIES:
+        _cache.pop(next(iter(_cache)))
+    _cache[key] = (time.monotonic() + _CACHE_TTL_SECONDS, tool_response)
+    return None
+
+
+def clear_cache() -> None:
+    """Drop all cached shopping results (used by tests)."""
+    _cache.clear()
@@ -0,0 +1,62 @@
+"""Async token-bucket pacing for Brightdata tool calls.
+
+Bounded concurrency (the batch semaphores) caps how many calls are in
+flight, but a fan-out can still burst past Brightdata's per-second quota
+and trigger 429 retries whose backoff dominates tail latency. This module
+paces outbound calls with a token bucket and exposes it as a
+``before_tool_callback`` that never short-circuits the tool.
+"""
+
+import asyncio
+import time
+from typing import Any
+
+
+class TokenBucket:
+    """Token bucket refilled at ``rate`` tokens/second up to ``burst``."""
+
+    def __init__(self, rate: float, burst: float) -> None:
+        self.rate = rate
+        self.burst = burst
+        self._tokens = burst
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        """Wait until a token is available, then consume it.
+
+        The lock serializes waiters, so pacing holds across concurrent
+        callers without busy-waiting.
+        """
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.burst, self._tokens + (now - self._updated) * self.rate
+                )
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+# Outbound Brightdata calls are paced below the per-second quota; the burst
+# lets a small fan-out start immediately.
+_SCRAPE_RPS = 5.0
+_SCRAPE_BURST = 8.0
+_scrape_bucket = TokenBucket(_SCRAPE_RPS, _SCRAPE_BURST)
+
+# Brightdata MCP tool names subject to pacing.
+_THROTTLED_TOOLS = frozenset(
+    {"scrape_as_markdown", "scrape_batch", "search_engine", "search_engine_batch"}
+)
+
+
+async def throttle_brightdata(
+    tool: Any, args: dict[str, Any], tool_context: Any
+) -> None:
+    """`before_tool_callback`: pace Brightdata calls; never short-circuits."""
+    if tool.name in _THROTTLED_TOOLS:
+        await _scrape_bucket.acquire()
+    return None
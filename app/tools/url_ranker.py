@@ -0,0 +1,120 @@
+"""Deterministic SERP URL filtering and ranking.
+
+The shopping agent's prompt used to walk the model through filtering,
+deduplicating, and tier-ranking SERP URLs — pure string work that cost
+output tokens and a reasoning pass per query, with unstable results. This
+module does the same steps in Python so the model makes one tool call and
+gets back a deterministically sorted url/tier list.
+"""
+
+from typing import Any
+from urllib.parse import urlsplit
+
+from app.tools.price_extract import is_aggregator
+
+# Domains that never sell the product: search engines, social media,
+# forums, reference and news sites.
+_BLOCKED_DOMAINS = frozenset(
+    {
+        "google.com",
+        "bing.com",
+        "yandex.ru",
+        "duckduckgo.com",
+        "youtube.com",
+        "facebook.com",
+        "instagram.com",
+        "twitter.com",
+        "x.com",
+        "reddit.com",
+        "pinterest.com",
+        "tiktok.com",
+        "quora.com",
+        "medium.com",
+        "wikipedia.org",
+    }
+)
+
+# International retailers that run per-country storefronts; with a country
+# domain they rank tier 2, otherwise tier 3.
+_INTERNATIONAL_RETAILERS = frozenset({"amazon", "ebay", "mediamarkt", "aliexpress"})
+
+# Known major local retailers whose domain is not on the country TLD.
+_LOCAL_RETAILERS = {
+    "finland": frozenset({"verkkokauppa.com", "power.fi", "gigantti.fi"}),
+}
+
+# Country name -> country-code TLD used to recognize local shops.
+_COUNTRY_TLDS = {
+    "finland": "fi",
+    "sweden": "se",
+    "norway": "no",
+    "denmark": "dk",
+    "germany": "de",
+    "france": "fr",
+    "spain": "es",
+    "italy": "it",
+    "netherlands": "nl",
+    "poland": "pl",
+    "uk": "uk",
+    "united kingdom": "uk",
+}
+
+
+def _host(url: str) -> str:
+    """Lowercased host with any leading www. stripped."""
+    host = (urlsplit(url).hostname or "").lower()
+    return host.removeprefix("www.")
+
+
+def _tier(url: str, host: str, country_key: str, country_tld: str | None) -> int:
+    """Assign the priority tier the shopping prompt describes.
+
+    Tier 1: local shops and price-comparison sites; tier 2: international
+    retailers with a country site; tier 3: generic international.
+    """
+    if is_aggregator(url) or host in _LOCAL_RETAILERS.get(country_key, ()):
+        return 1
+    local = country_tld is not None and host.endswith("." + country_tld)
+    if host.split(".")[0] in _INTERNATIONAL_RETAILERS:
+        return 2 if local else 3
+    return 1 if local else 3
+
+
+def filter_and_rank_urls(urls: list[str], country: str) -> list[dict[str, Any]]:
+    """Filter, deduplicate, and tier-rank SERP result URLs.
+
+    Drops non-shop domains (search engines, social media, reference
+    sites), keeps the first URL per shop domain, assigns priority tiers,
+    and returns the entries deterministically sorted by tier, then
+    domain, then path.
+
+    Args:
+        urls: URLs from the SERP results, in result order
+        country: Country name the user is shopping in
+
+    Returns:
+        Sorted list of {"url": ..., "tier": ...} entries
+    """
+    country_key = country.strip().lower()
+    country_tld = _COUNTRY_TLDS.get(country_key)
+
+    seen_hosts: set[str] = set()
+    entries: list[tuple[int, str, str, str]] = []
+    for url in urls:
+        if not url.startswith(("http://", "https://")):
+            continue
+        host = _host(url)
+        if not host or host in seen_hosts:
+            continue
+        if any(
+            host == blocked or host.endswith("." + blocked)
+            for blocked in _BLOCKED_DOMAINS
+        ):
+            continue
+        seen_hosts.add(host)
+        entries.append(
+            (_tier(url, host, country_key, country_tld), host, urlsplit(url).path, url)
+        )
+
+    entries.sort()
+    return [{"url": url, "tier": tier} for tier, _host_, _path, url in entries]
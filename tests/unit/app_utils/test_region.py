@@ -0,0 +1,38 @@
+from app.app_utils.region import detect_region
+
+
+class TestDetectRegion:
+    """Test region-code detection from free-form user messages."""
+
+    def test_detects_full_country_name(self) -> None:
+        assert detect_region("Best headphones in Finland") == "fi-fi"
+
+    def test_detects_multi_word_country(self) -> None:
+        assert detect_region("iPhone 15 price in United States") == "us-en"
+
+    def test_detection_is_case_insensitive(self) -> None:
+        assert detect_region("best laptops GERMANY") == "de-de"
+
+    def test_short_code_requires_word_boundary(self) -> None:
+        # "us" inside "because" must not match
+        assert detect_region("because I want headphones") is None
+
+    def test_uppercase_code_matches(self) -> None:
+        assert detect_region("cheapest in the US please") == "us-en"
+        assert detect_region("ship to FI") == "fi-fi"
+
+    def test_lowercase_code_is_not_a_country(self) -> None:
+        # "us" and "de" as English words/fragments must not match
+        assert detect_region("help us find the best headphones") is None
+        assert detect_region("de facto the best option") is None
+
+    def test_hyphenated_word_is_not_a_code(self) -> None:
+        # hyphens are word boundaries; "wi-fi" / "WI-FI" must not match
+        assert detect_region("best wi-fi router under 100") is None
+        assert detect_region("best WI-FI router under 100") is None
+
+    def test_returns_none_when_no_country_mentioned(self) -> None:
+        assert detect_region("best wireless headphones under 100") is None
+
+    def test_longest_name_wins_over_short_code(self) -> None:
+        assert detect_region("shopping in united kingdom") == "uk-en"
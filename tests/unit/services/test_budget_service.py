@@ -16,10 +16,10 @@ class TestBudgetService:
         """Create a mock Redis client."""
         client = Mock()
         # Make async methods return AsyncMock
-        client.incr = AsyncMock()
-        client.expire = AsyncMock()
         client.delete = AsyncMock()
         client.get = AsyncMock()
+        # register_script returns an awaitable script callable
+        client.register_script = Mock(return_value=AsyncMock())
         return client
 
     @pytest.fixture
@@ -44,60 +44,61 @@ class TestBudgetService:
     async def test_check_and_increment_first_message(
         self, budget_service: BudgetService, mock_redis_client: Mock
     ) -> None:
-        """Test first message increments counter and sets TTL."""
-        mock_redis_client.incr.return_value = 1
+        """Test first message increments counter via the Lua script."""
+        script = mock_redis_client.register_script.return_value
+        script.return_value = 1
 
         result = await budget_service.check_and_increment("user123")
 
         assert result is True
-        mock_redis_client.incr.assert_called_once_with("budget:user123")
-        mock_redis_client.expire.assert_called_once_with("budget:user123", 86400)
+        script.assert_called_once_with(keys=["budget:user123"], args=[86400])
 
     @pytest.mark.asyncio
     async def test_check_and_increment_under_limit(
         self, budget_service: BudgetService, mock_redis_client: Mock
     ) -> None:
         """Test message under limit returns True."""
-        mock_redis_client.incr.return_value = 5
+        script = mock_redis_client.register_script.return_value
+        script.return_value = 5
 
         result = await budget_service.check_and_increment("user123")
 
         assert result is True
-        mock_redis_client.incr.assert_called_once_with("budget:user123")
-        mock_redis_client.expire.assert_not_called()
+        script.assert_called_once_with(keys=["budget:user123"], args=[86400])
 
     @pytest.mark.asyncio
     async def test_check_and_increment_at_limit(
         self, budget_service: BudgetService, mock_redis_client: Mock
     ) -> None:
         """Test message at limit returns True."""
-        mock_redis_client.incr.return_value = 10
+        script = mock_redis_client.register_script.return_value
+        script.return_value = 10
 
         result = await budget_service.check_and_increment("user123")
 
         assert result is True
-        mock_redis_client.incr.assert_called_once_with("budget:user123")
-        mock_redis_client.expire.assert_not_called()
+        script.assert_called_once_with(keys=["budget:user123"], args=[86400])
 
     @pytest.mark.asyncio
     async def test_check_and_increment_over_limit(
         self, budget_service: BudgetService, mock_redis_client: Mock
     ) -> None:
         """Test message over limit returns False."""
-        mock_redis_client.incr.return_value = 11
+        script = mock_redis_client.register_script.return_value
+        script.return_value = 11
 
         result = await budget_service.check_and_increment("user123")
 
         assert result is False
-        mock_redis_client.incr.assert_called_once_with("budget:user123")
-        mock_redis_client.expire.assert_not_called()
+        script.assert_called_once_with(keys=["budget:user123"], args=[86400])
 
     @pytest.mark.asyncio
     async def test_check_and_increment_error_raises_exception(
         self, budget_service: BudgetService, mock_redis_client: Mock
     ) -> None:
         """Test that errors raise exceptions instead of failing open."""
-        mock_redis_client.incr.side_effect = Exception("Redis error")
+        script = mock_redis_client.register_script.return_value
+        script.side_effect = Exception("Redis error")
 
         with pytest.raises(Exception, match="Redis error"):
             await budget_service.check_and_increment("user123")
@@ -184,5 +185,5 @@ class TestBudgetService:
         assert service.redis_client == mock_redis_client
         assert service.limit == 5
         assert service.ttl == 3600
-        assert service.whitelist == ["user1", "user2"]
+        assert service.whitelist == frozenset({"user1", "user2"})
         assert isinstance(service.logger, logging.Logger)
@@ -376,7 +376,7 @@ class TestTelegramService:
         ) as mock_application_class:
             # Mock the application instance
             mock_application = Mock()
-            mock_application_class.builder.return_value.token.return_value.build.return_value = mock_application
+            mock_application_class.builder.return_value.token.return_value.request.return_value.build.return_value = mock_application
             mock_application.run_polling = Mock()
 
             # Mock the setup_handlers method
@@ -390,7 +390,7 @@ class TestTelegramService:
                 mock_application_class.builder.return_value.token.assert_called_once_with(
                     "test_bot_token"
                 )
-                mock_application_class.builder.return_value.token.return_value.build.assert_called_once()
+                mock_application_class.builder.return_value.token.return_value.request.return_value.build.assert_called_once()
 
                 # Verify setup_handlers was called
                 mock_setup_handlers.assert_called_once()
@@ -404,7 +404,7 @@ class TestTelegramService:
             "app.services.telegram_service.Application"
         ) as mock_application_class:
             # Make build raise an exception
-            mock_application_class.builder.return_value.token.return_value.build.side_effect = Exception(
+            mock_application_class.builder.return_value.token.return_value.request.return_value.build.side_effect = Exception(
                 "Build error"
             )
 
@@ -0,0 +1,78 @@
+import asyncio
+from typing import Any, cast
+
+import pytest
+from google.adk.tools import ToolContext
+
+from app.tools import extract_batch
+from app.tools.extract_batch import extract_prices_parallel
+
+# The batch never touches the context when the tool name is off the
+# price-result cache's list, so a typed None stand-in suffices.
+_TOOL_CONTEXT = cast(ToolContext, None)
+
+
+class _FakeExtractorTool:
+    """Stands in for the price-extractor AgentTool.
+
+    The name stays off the price-result cache's tool list so these tests
+    exercise the batch logic without cross-test cache state.
+    """
+
+    name = "fake_extractor"
+
+    def __init__(self, slow_urls: set[str] | None = None) -> None:
+        self.slow_urls = slow_urls or set()
+
+    async def run_async(self, *, args: dict[str, Any], tool_context: Any) -> Any:
+        if args["url"] in self.slow_urls:
+            await asyncio.sleep(3600)
+        return {"url": args["url"], "price": 9.99, "tier": args["tier"], "error": None}
+
+
+class TestExtractPricesParallel:
+    """Test the batched extraction fan-out."""
+
+    @pytest.mark.asyncio
+    async def test_results_come_back_in_input_order(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr(
+            extract_batch, "_get_extractor_tool", lambda: _FakeExtractorTool()
+        )
+        urls = [f"https://s{i}.com/p" for i in range(3)]
+        results = await extract_prices_parallel(
+            urls, [1, 2, 3], "widget", _TOOL_CONTEXT
+        )
+        assert [r["url"] for r in results] == urls
+        assert [r["tier"] for r in results] == [1, 2, 3]
+
+    @pytest.mark.asyncio
+    async def test_length_mismatch_returns_inline_errors(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr(
+            extract_batch, "_get_extractor_tool", lambda: _FakeExtractorTool()
+        )
+        results = await extract_prices_parallel(
+            ["https://a.com/p"], [], "widget", _TOOL_CONTEXT
+        )
+        assert results == [
+            {"url": "https://a.com/p", "error": "urls/tiers length mismatch: 1 != 0"}
+        ]
+
+    @pytest.mark.asyncio
+    async def test_straggler_is_cancelled_once_enough_results_are_in(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        urls = [f"https://s{i}.com/p" for i in range(6)]
+        slow = urls[-1]
+        monkeypatch.setattr(
+            extract_batch,
+            "_get_extractor_tool",
+            lambda: _FakeExtractorTool(slow_urls={slow}),
+        )
+        monkeypatch.setattr(extract_batch, "_SOFT_DEADLINE_SECONDS", 0.0)
+        results = await extract_prices_parallel(urls, [1] * 6, "widget", _TOOL_CONTEXT)
+        assert results[-1]["error"].startswith("cancelled")
+        assert all(r["error"] is None for r in results[:-1])
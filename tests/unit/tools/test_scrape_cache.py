@@ -0,0 +1,83 @@
+import time
+from collections.abc import Iterator
+from types import SimpleNamespace
+
+import pytest
+
+from app.tools import scrape_cache
+from app.tools.scrape_cache import (
+    _canonicalize,
+    clear_cache,
+    scrape_cache_lookup,
+    scrape_cache_store,
+)
+
+_TOOL = SimpleNamespace(name="scrape_as_markdown")
+
+
+@pytest.fixture(autouse=True)
+def _fresh_cache() -> Iterator[None]:
+    clear_cache()
+    yield
+    clear_cache()
+
+
+class TestCanonicalize:
+    """Test URL canonicalization for cache keys."""
+
+    def test_drops_fragment_and_tracking_params(self) -> None:
+        url = "https://Shop.com/p?utm_source=x&b=2&a=1#reviews"
+        assert _canonicalize(url) == "https://shop.com/p?a=1&b=2"
+
+    def test_tracking_variants_share_a_key(self) -> None:
+        assert _canonicalize("https://shop.com/p?gclid=abc") == _canonicalize(
+            "https://shop.com/p?fbclid=def"
+        )
+
+
+class TestScrapeCache:
+    """Test TTL behaviour of the scrape response cache."""
+
+    @pytest.mark.asyncio
+    async def test_stores_and_serves_hits(self) -> None:
+        args = {"url": "https://shop.com/p"}
+        assert await scrape_cache_lookup(_TOOL, args, None) is None
+        scrape_cache_store(_TOOL, args, None, "page text")
+        assert await scrape_cache_lookup(_TOOL, args, None) == "page text"
+
+    @pytest.mark.asyncio
+    async def test_expired_entries_miss(self) -> None:
+        args = {"url": "https://shop.com/p"}
+        await scrape_cache_lookup(_TOOL, args, None)
+        scrape_cache_store(_TOOL, args, None, "page text")
+        key = next(iter(scrape_cache._cache))
+        scrape_cache._cache[key] = (time.monotonic() - 1, "page text")
+        assert await scrape_cache_lookup(_TOOL, args, None) is None
+
+    @pytest.mark.asyncio
+    async def test_restoring_a_served_hit_keeps_the_original_expiry(self) -> None:
+        args = {"url": "https://shop.com/p"}
+        await scrape_cache_lookup(_TOOL, args, None)
+        scrape_cache_store(_TOOL, args, None, "page text")
+        key = next(iter(scrape_cache._cache))
+        original_expiry = scrape_cache._cache[key][0]
+        served = await scrape_cache_lookup(_TOOL, args, None)
+        # after_tool_callback also fires for short-circuited calls; the
+        # re-store of the served object must not refresh the TTL
+        scrape_cache_store(_TOOL, args, None, served)
+        assert scrape_cache._cache[key][0] == original_expiry
+
+    def test_eviction_bounds_the_cache(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(scrape_cache, "_MAX_ENTRIES", 2)
+        for i in range(3):
+            scrape_cache_store(_TOOL, {"url": f"https://s{i}.com/"}, None, f"p{i}")
+        assert len(scrape_cache._cache) == 2
+
+    @pytest.mark.asyncio
+    async def test_other_tools_bypass_the_cache(self) -> None:
+        other = SimpleNamespace(name="search_engine")
+        scrape_cache_store(other, {"url": "https://shop.com/p"}, None, "serp")
+        assert (
+            await scrape_cache_lookup(other, {"url": "https://shop.com/p"}, None)
+            is None
+        )
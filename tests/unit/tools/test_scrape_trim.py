@@ -0,0 +1,51 @@
+from app.tools.scrape_trim import (
+    _MAX_SCRAPE_CHARS,
+    map_scrape_text,
+    trim_scraped_markdown,
+)
+
+
+class TestTrimScrapedMarkdown:
+    """Test bounding of scraped markdown before it reaches the model."""
+
+    def test_pages_within_budget_pass_through_unchanged(self) -> None:
+        text = "# Product\n99.90 EUR\nVarastossa\n"
+        assert trim_scraped_markdown(text) == text
+
+    def test_oversized_page_is_bounded_and_keeps_the_price(self) -> None:
+        text = "filler\n" * 10_000 + "Total: 99.90 EUR\n" + "filler\n" * 10_000
+        trimmed = trim_scraped_markdown(text)
+        assert len(trimmed) <= _MAX_SCRAPE_CHARS
+        assert "99.90 EUR" in trimmed
+
+    def test_relevance_filter_keeps_head_and_pricing_region(self) -> None:
+        head = "\n".join(f"# heading {i}" for i in range(10))
+        noise = "\n".join(["navigation boilerplate " * 5] * 2_000)
+        pricing = "\n".join(["| Store | availability column " * 10] * 4)
+        page = f"{head}\n{noise}\n{pricing}\nTotal: 99.90 EUR\n{noise}"
+        trimmed = trim_scraped_markdown(page)
+        assert "# heading 0" in trimmed
+        assert "99.90 EUR" in trimmed
+        # Distant boilerplate is gone; only context lines near hits survive
+        assert len(trimmed) < len(page) // 10
+
+
+class TestMapScrapeText:
+    """Test transform application across MCP scrape response shapes."""
+
+    def test_plain_string_response_is_transformed(self) -> None:
+        assert map_scrape_text("abc", str.upper) == "ABC"
+
+    def test_dict_response_preserves_other_keys(self) -> None:
+        response = {"result": "abc", "isError": False}
+        assert map_scrape_text(response, str.upper) == {
+            "result": "ABC",
+            "isError": False,
+        }
+
+    def test_returns_none_when_transform_is_a_no_op(self) -> None:
+        assert map_scrape_text("abc", lambda text: text) is None
+
+    def test_returns_none_for_textless_responses(self) -> None:
+        assert map_scrape_text(123, str.upper) is None
+        assert map_scrape_text({"status": "ok"}, str.upper) is None
@@ -0,0 +1,54 @@
+from app.tools.url_ranker import filter_and_rank_urls
+
+
+class TestFilterAndRankUrls:
+    """Test deterministic SERP URL filtering and ranking."""
+
+    def test_drops_blocked_and_non_http_urls(self) -> None:
+        urls = [
+            "https://www.google.com/search?q=headphones",
+            "https://en.wikipedia.org/wiki/Headphones",
+            "ftp://files.example.com/list",
+            "https://verkkokauppa.com/fi/product/123",
+        ]
+        ranked = filter_and_rank_urls(urls, "Finland")
+        assert [e["url"] for e in ranked] == ["https://verkkokauppa.com/fi/product/123"]
+
+    def test_keeps_first_url_per_host(self) -> None:
+        urls = ["https://power.fi/a", "https://www.power.fi/b"]
+        ranked = filter_and_rank_urls(urls, "Finland")
+        assert [e["url"] for e in ranked] == ["https://power.fi/a"]
+
+    def test_aggregators_and_local_retailers_are_tier_one(self) -> None:
+        ranked = filter_and_rank_urls(
+            ["https://hinta.fi/2162671", "https://verkkokauppa.com/p/1"], "Finland"
+        )
+        assert [e["tier"] for e in ranked] == [1, 1]
+
+    def test_country_tld_is_tier_one(self) -> None:
+        ranked = filter_and_rank_urls(["https://jimms.fi/product/1"], "Finland")
+        assert ranked[0]["tier"] == 1
+
+    def test_international_retailer_with_country_site_is_tier_two(self) -> None:
+        ranked = filter_and_rank_urls(["https://www.amazon.de/dp/B01"], "Germany")
+        assert ranked[0]["tier"] == 2
+
+    def test_international_retailer_without_country_site_is_tier_three(self) -> None:
+        ranked = filter_and_rank_urls(["https://www.amazon.com/dp/B01"], "Finland")
+        assert ranked[0]["tier"] == 3
+
+    def test_sorted_by_tier_then_host_then_path(self) -> None:
+        urls = [
+            "https://zshop.com/x",
+            "https://www.amazon.de/dp/B01",
+            "https://hinta.fi/2162671",
+        ]
+        ranked = filter_and_rank_urls(urls, "Germany")
+        assert [e["tier"] for e in ranked] == [1, 2, 3]
+        assert ranked[0]["url"] == "https://hinta.fi/2162671"
+
+    def test_unknown_country_still_ranks_aggregators_first(self) -> None:
+        ranked = filter_and_rank_urls(
+            ["https://someshop.com/p/1", "https://idealo.de/item"], "Atlantis"
+        )
+        assert [e["tier"] for e in ranked] == [1, 3]